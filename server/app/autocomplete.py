@@ -0,0 +1,218 @@
+"""
+In-memory typeahead index over the catalog identifiers.
+Component ids, element ids and component names of every family table are kept in
+sorted arrays of lower-cased keys, so a prefix lookup is a binary search followed
+by a short forward scan: its cost depends on the number of suggestions returned,
+not on the catalog size. Ids are also indexed from each segment (``fau_gen.1.1``
+is found by ``gen.1`` and ``1.1``), and names from each word.
+
+The index is built at startup and marked stale by imports and CRUD writes;
+writes made by the CLI or another worker are noticed through
+:class:`CatalogVersionGuard`. Lookups never wait for the database: the next one
+after a change starts a rebuild in a background thread and keeps answering from
+the previous generation until the new one is swapped in.
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .catalog_version import CatalogVersionGuard
+from .xml_parser_service import XmlParserService
+
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+
+logger = logging.getLogger("uvicorn.error")
+
+# Where an id segment or a name word starts
+ID_SEGMENT_RE = re.compile(r"[_.\-]")
+WORD_RE = re.compile(r"\w+")
+
+
+def id_segments(value: str) -> List[str]:
+    """Suffixes of an id starting after each separator: ``fau_gen.1`` -> ``gen.1``, ``1``."""
+    return [value[match.end():] for match in ID_SEGMENT_RE.finditer(value) if match.end() < len(value)]
+
+
+def name_words(value: str) -> List[str]:
+    """Suffixes of a name starting at each word after the first."""
+    return [value[match.start():] for match in WORD_RE.finditer(value) if match.start() > 0]
+
+
+class _Keys:
+    """Sorted (key, suggestion) pairs split into parallel arrays for bisect."""
+
+    def __init__(self, pairs: List[Tuple[str, int]]):
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.suggestions = [suggestion for _, suggestion in pairs]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class AutocompleteIndex:
+    """
+    Prefix index of the family tables.
+
+    Whole values are matched before segments and words, so ``fau`` lists
+    ``fau_gen.1`` ahead of names that merely contain a word starting with it.
+    Each lookup reads one immutable generation of the arrays, so a rebuild can
+    swap in a new one while lookups run.
+    """
+
+    def __init__(self):
+        # (suggestions, whole-value keys, segment and word keys), replaced as one
+        self._generation: Tuple[List[Dict[str, Any]], _Keys, _Keys] = ([], _Keys([]), _Keys([]))
+        self._stale = True
+        self._built_at: Optional[float] = None
+        self._build_seconds = 0.0
+        self._guard = CatalogVersionGuard()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def invalidate(self) -> None:
+        """Mark the index out of date after the catalog changed."""
+        self._stale = True
+
+    def refresh(self, session_factory: Callable[[], Session]) -> None:
+        """
+        Bring the index up to date after an invalidation or a write in another process.
+
+        Only the very first build runs in the caller; later ones run in a
+        background thread while lookups keep reading the current generation.
+        """
+        if not self._stale and not self._guard.needs_check():
+            return
+        if self._built_at is None:
+            self._refresh(session_factory)
+            return
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(
+            target=self._refresh_in_background, args=(session_factory,), name="autocomplete-refresh", daemon=True
+        ).start()
+
+    def _refresh(self, session_factory: Callable[[], Session]) -> None:
+        db = session_factory()
+        try:
+            if not self._stale and self._guard.is_current(db):
+                return
+            self._stale = True
+            self.rebuild(db)
+        finally:
+            db.close()
+
+    def _refresh_in_background(self, session_factory: Callable[[], Session]) -> None:
+        try:
+            self._refresh(session_factory)
+        except Exception:
+            # Still stale, so the next lookup tries again
+            logger.exception("Rebuilding the autocomplete index failed")
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def rebuild(self, db: Session) -> None:
+        """Reload every identifier from the family tables."""
+        with self._lock:
+            # Another request may have rebuilt it while this one waited
+            if not self._stale and self._built_at is not None:
+                return
+            started = time.perf_counter()
+            # Cleared first so writes made during the rebuild mark it stale again
+            self._stale = False
+            try:
+                self._guard.building(db)
+                suggestions, whole, partial = self._load(db)
+            except Exception:
+                self._stale = True
+                raise
+            self._generation = (suggestions, _Keys(whole), _Keys(partial))
+            self._built_at = time.time()
+            self._build_seconds = time.perf_counter() - started
+
+    def _load(self, db: Session) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int]], List[Tuple[str, int]]]:
+        service = XmlParserService()
+        tables = [(model.__table__, "functional") for model in service.functional_table_mappings.values()]
+        tables += [(model.__table__, "assurance") for model in service.assurance_table_mappings.values()]
+
+        suggestions: List[Dict[str, Any]] = []
+        seen = set()
+        whole: List[Tuple[str, int]] = []
+        partial: List[Tuple[str, int]] = []
+
+        def add(value: Optional[str], kind: str, table_name: str, table_kind: str, component, component_name) -> None:
+            value = (value or "").strip()
+            if not value or (kind, table_name, value) in seen:
+                return
+            seen.add((kind, table_name, value))
+            position = len(suggestions)
+            suggestions.append({
+                "value": value,
+                "type": kind,
+                "table": table_name,
+                "kind": table_kind,
+                "component": component,
+                "component_name": component_name,
+            })
+            key = value.lower()
+            whole.append((key, position))
+            for suffix in (name_words(key) if kind == "component_name" else id_segments(key)):
+                partial.append((suffix, position))
+
+        for table, table_kind in tables:
+            table_name = str(table.name)
+            rows = db.execute(
+                select(table.c.component, table.c.component_name, table.c.element).order_by(table.c.id)
+            ).all()
+            for component, component_name, element in rows:
+                add(component, "component", table_name, table_kind, component, component_name)
+                add(element, "element", table_name, table_kind, component, component_name)
+                add(component_name, "component_name", table_name, table_kind, component, component_name)
+        return suggestions, whole, partial
+
+    def lookup(self, prefix: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """Suggestions whose value, an id segment or a name word starts with ``prefix`` (case-insensitive)."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        suggestions, whole, partial = self._generation
+        found: List[int] = []
+        seen = set()
+        for keys in (whole, partial):
+            position = bisect_left(keys.keys, prefix)
+            while position < len(keys) and len(found) < limit and keys.keys[position].startswith(prefix):
+                suggestion = keys.suggestions[position]
+                if suggestion not in seen:
+                    seen.add(suggestion)
+                    found.append(suggestion)
+                position += 1
+        return [suggestions[index] for index in found]
+
+    def stats(self) -> Dict[str, Any]:
+        suggestions, whole, partial = self._generation
+        return {
+            "suggestions": len(suggestions),
+            "keys": len(whole) + len(partial),
+            "stale": self._stale,
+            "built_at": self._built_at,
+            "build_seconds": round(self._build_seconds, 6),
+        }
+
+
+autocomplete_index = AutocompleteIndex()
@@ -0,0 +1,166 @@
+"""
+Batched bulk writer for catalog imports.
+Rows are grouped per target table and written with Core executemany batches,
+or with COPY FROM STDIN when the session is bound to PostgreSQL via psycopg2.
+Keyed rows can be upserted with INSERT ... ON CONFLICT DO UPDATE.
+"""
+import io
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, bindparam, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+DEFAULT_BATCH_SIZE = int(os.getenv("XML_IMPORT_BATCH_SIZE", "1000"))
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a value for COPY text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class BulkRowWriter:
+    """Buffer rows per table and write them in batches."""
+
+    def __init__(self, db: Session, batch_size: Optional[int] = None, use_copy: Optional[bool] = None):
+        self.db = db
+        self.batch_size = max(1, batch_size or DEFAULT_BATCH_SIZE)
+        dialect = db.get_bind().dialect
+        if use_copy is None:
+            use_copy = dialect.name == "postgresql" and dialect.driver == "psycopg2"
+        self.use_copy = use_copy
+        self._dialect_name = dialect.name
+        self._preparer = dialect.identifier_preparer
+        self._tables: Dict[str, Table] = {}
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        # Upserts are de-duplicated on their key so a batch never hits the same row twice
+        self._pending_upserts: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self._upsert_specs: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def add(self, table: Table, row: Dict[str, Any]) -> None:
+        """Queue a row for ``table``, writing the batch once it is full."""
+        self._tables[table.name] = table
+        pending = self._pending.setdefault(table.name, [])
+        pending.append(row)
+        if len(pending) >= self.batch_size:
+            self._flush_table(table.name)
+
+    def upsert(self, table: Table, row: Dict[str, Any], key: str, update_columns: Sequence[str]) -> None:
+        """Queue a row that replaces ``update_columns`` of an existing row with the same ``key``."""
+        self._tables[table.name] = table
+        self._upsert_specs[table.name] = (key, tuple(update_columns))
+        pending = self._pending_upserts.setdefault(table.name, {})
+        pending[row[key]] = row
+        if len(pending) >= self.batch_size:
+            self._flush_upserts(table.name)
+
+    def flush(self) -> None:
+        """Write every queued row."""
+        for table_name in list(self._pending):
+            self._flush_table(table_name)
+        for table_name in list(self._pending_upserts):
+            self._flush_upserts(table_name)
+
+    def table_stats(self) -> Dict[str, Dict[str, float]]:
+        """Rows written, seconds spent and throughput per table."""
+        result = {}
+        for table_name, stats in self.stats.items():
+            seconds = stats["seconds"]
+            result[table_name] = {
+                "rows": int(stats["rows"]),
+                "seconds": round(seconds, 6),
+                "rows_per_second": round(stats["rows"] / seconds, 1) if seconds > 0 else None,
+            }
+        return result
+
+    def _flush_table(self, table_name: str) -> None:
+        rows = self._pending.pop(table_name, None)
+        if not rows:
+            return
+
+        table = self._tables[table_name]
+        started = time.perf_counter()
+        if self.use_copy:
+            self._copy_rows(table, rows)
+        else:
+            self.db.execute(insert(table), rows)
+        self._record(table_name, len(rows), time.perf_counter() - started)
+
+    def _flush_upserts(self, table_name: str) -> None:
+        pending = self._pending_upserts.pop(table_name, None)
+        if not pending:
+            return
+
+        table = self._tables[table_name]
+        key, update_columns = self._upsert_specs[table_name]
+        rows = list(pending.values())
+        started = time.perf_counter()
+        if self._dialect_name in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if self._dialect_name == "postgresql" else sqlite.insert
+            statement = dialect_insert(table)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c[key]],
+                set_={column: statement.excluded[column] for column in update_columns},
+            )
+            self.db.execute(statement, rows)
+        else:
+            self._upsert_without_on_conflict(table, key, update_columns, rows)
+        self._record(table_name, len(rows), time.perf_counter() - started)
+
+    def _upsert_without_on_conflict(
+        self, table: Table, key: str, update_columns: Tuple[str, ...], rows: List[Dict[str, Any]]
+    ) -> None:
+        """Portable fallback: one lookup for the whole batch, then executemany update/insert."""
+        key_column = table.c[key]
+        keys = [row[key] for row in rows]
+        existing = set(self.db.execute(select(key_column).where(key_column.in_(keys))).scalars())
+        updates = [row for row in rows if row[key] in existing]
+        inserts = [row for row in rows if row[key] not in existing]
+        if updates:
+            statement = (
+                update(table)
+                .where(key_column == bindparam("_key"))
+                .values({column: bindparam(f"_{column}") for column in update_columns})
+            )
+            self.db.execute(
+                statement,
+                [{"_key": row[key], **{f"_{column}": row.get(column) for column in update_columns}} for row in updates],
+            )
+        if inserts:
+            self.db.execute(insert(table), inserts)
+
+    def _record(self, table_name: str, rows: int, elapsed: float) -> None:
+        stats = self.stats.setdefault(table_name, {"rows": 0, "seconds": 0.0})
+        stats["rows"] += rows
+        stats["seconds"] += elapsed
+
+    def _copy_rows(self, table: Table, rows: List[Dict[str, Any]]) -> None:
+        """Stream a batch into PostgreSQL with COPY FROM STDIN."""
+        columns = list(rows[0].keys())
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row.get(column)) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        column_list = ", ".join(self._preparer.quote(column) for column in columns)
+        statement = f"COPY {self._preparer.format_table(table)} ({column_list}) FROM STDIN"
+
+        # Run on the session's own connection so the rows share its transaction
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(statement, buffer)
+        finally:
+            cursor.close()
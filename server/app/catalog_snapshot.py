@@ -0,0 +1,242 @@
+"""
+Prebuilt catalog snapshots.
+A snapshot holds the rows of every family table and element_list_db as gzip
+compressed JSON lines: a header line (format version, SHA-256 of the source XML,
+catalog version, row counts) followed by one line per table. Loading one is a
+bulk insert (COPY on PostgreSQL), so an empty database gets a usable catalog at
+startup without parsing the XML.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, sessionmaker
+
+from .bulk_writer import BulkRowWriter
+from .catalog_version import bump_catalog_revision
+from .fast_json import dumps
+from .models import ImportHistory
+from .parse_cache import DIGEST_CHUNK_BYTES
+from .xml_parser_service import XmlParserService
+
+
+SNAPSHOT_FORMAT = "ccgentool2-catalog-snapshot"
+# Bump whenever the line layout changes; older snapshots are then refused
+SNAPSHOT_VERSION = 1
+
+SERVER_ROOT = Path(__file__).resolve().parents[1]
+SNAPSHOT_PATH = Path(os.getenv("CATALOG_SNAPSHOT", SERVER_ROOT / "snapshots" / "catalog.json.gz"))
+# Source catalog used to detect stale snapshots; skipped when the file is absent (e.g. in the container)
+SNAPSHOT_SOURCE_XML = Path(os.getenv("CATALOG_XML", SERVER_ROOT.parent / "oldparser" / "cc.xml"))
+SNAPSHOT_BOOTSTRAP = os.getenv("CATALOG_SNAPSHOT_BOOTSTRAP", "1").lower() not in ("0", "false", "no")
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def source_digest(path: Union[str, Path]) -> str:
+    """SHA-256 of a catalog file as stored on disk."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(DIGEST_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _snapshot_columns(table) -> List[str]:
+    # Ids are assigned by the loading database; generated columns recompute themselves
+    return [column.name for column in table.columns if not column.primary_key and column.computed is None]
+
+
+def export_snapshot(
+    db: Session,
+    path: Union[str, Path],
+    source_digest: Optional[str] = None,
+    source: Optional[str] = None,
+    catalog_version: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Write the current catalog to ``path``.
+
+    Args:
+        db: Session to read the catalog tables from
+        path: Snapshot file to (re)write; replaced atomically
+        source_digest: :func:`source_digest` of the XML the catalog was imported from
+        source: Name of that XML file
+        catalog_version: Defaults to the version recorded by the last successful import
+
+    Returns:
+        The snapshot header
+    """
+    path = Path(path)
+    if catalog_version is None:
+        catalog_version = db.execute(
+            select(ImportHistory.catalog_version)
+            .where(ImportHistory.success.is_(True))
+            .order_by(ImportHistory.id.desc())
+            .limit(1)
+        ).scalar()
+
+    tables = []
+    for table in XmlParserService().catalog_tables():
+        columns = _snapshot_columns(table)
+        rows = db.execute(select(*(table.c[column] for column in columns)).order_by(table.c.id)).all()
+        # Table names are quoted_name instances, which orjson does not accept as keys
+        tables.append((str(table.name), columns, [list(row) for row in rows]))
+
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": source,
+        "source_digest": source_digest,
+        "catalog_version": catalog_version,
+        "tables": {name: len(rows) for name, _, rows in tables},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    try:
+        # mtime=0: the header line already records when the snapshot was built
+        with open(partial, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as fh:
+            fh.write(dumps(header) + b"\n")
+            for name, columns, rows in tables:
+                fh.write(dumps({"table": name, "columns": columns, "rows": rows}) + b"\n")
+        partial.replace(path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return header
+
+
+def _read_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    with gzip.open(path, "rb") as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_snapshot_header(path: Union[str, Path]) -> Dict[str, Any]:
+    """Header of a snapshot; raises ValueError for files that are not a supported snapshot."""
+    try:
+        header = next(_read_lines(Path(path)), None)
+    except (OSError, EOFError, json.JSONDecodeError) as e:
+        raise ValueError(f"Unreadable catalog snapshot: {str(e)}")
+    if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"{path} is not a catalog snapshot")
+    if header.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported catalog snapshot version {header.get('version')} (expected {SNAPSHOT_VERSION})")
+    return header
+
+
+def snapshot_is_stale(header: Dict[str, Any], xml_path: Optional[Union[str, Path]] = None) -> bool:
+    """Whether the snapshot was built from a different XML than ``xml_path``; False when it cannot be checked."""
+    if xml_path is None or not Path(xml_path).is_file() or not header.get("source_digest"):
+        return False
+    return source_digest(xml_path) != header["source_digest"]
+
+
+def catalog_is_empty(db: Session) -> bool:
+    return all(
+        db.execute(select(table.c.id).limit(1)).first() is None
+        for table in XmlParserService().catalog_tables()
+    )
+
+
+def load_snapshot(db: Session, path: Union[str, Path], batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Bulk insert a snapshot into the catalog tables and commit.
+
+    The tables are expected to be empty. Columns the current schema no longer has
+    are dropped and columns added since the export are left NULL.
+
+    Returns:
+        The snapshot header, the rows loaded per table and the seconds taken
+    """
+    path = Path(path)
+    started = time.perf_counter()
+    started_at = datetime.now(timezone.utc)
+    header = read_snapshot_header(path)
+    tables = {table.name: table for table in XmlParserService().catalog_tables()}
+    writer = BulkRowWriter(db, batch_size=batch_size)
+    loaded: Dict[str, int] = {}
+    try:
+        lines = _read_lines(path)
+        next(lines)
+        for entry in lines:
+            table = tables.get(entry["table"])
+            if table is None:
+                continue
+            known = set(_snapshot_columns(table))
+            positions = [(index, column) for index, column in enumerate(entry["columns"]) if column in known]
+            for values in entry["rows"]:
+                writer.add(table, {column: values[index] for index, column in positions})
+            loaded[table.name] = len(entry["rows"])
+        writer.flush()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    seconds = time.perf_counter() - started
+    components = sum(count for name, count in loaded.items() if name != "element_list_db")
+    try:
+        db.add(ImportHistory(
+            started_at=started_at,
+            source=path.name[:255],
+            catalog_version=header.get("catalog_version"),
+            mode="snapshot",
+            success=True,
+            components_imported=components,
+            element_lists_imported=loaded.get("element_list_db", 0),
+            total_seconds=round(seconds, 6),
+        ))
+        bump_catalog_revision(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+    return {"header": header, "rows": loaded, "seconds": round(seconds, 6)}
+
+
+def bootstrap_catalog(
+    session_factory: sessionmaker,
+    path: Optional[Union[str, Path]] = None,
+    xml_path: Optional[Union[str, Path]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Load the snapshot when every catalog table is empty.
+
+    Never raises: a missing, stale or unreadable snapshot only means the catalog
+    has to be imported from XML as before.
+    """
+    path = Path(path or SNAPSHOT_PATH)
+    if not SNAPSHOT_BOOTSTRAP or not path.is_file():
+        return None
+    db = session_factory()
+    try:
+        if not catalog_is_empty(db):
+            return None
+        header = read_snapshot_header(path)
+        source_xml = xml_path or SNAPSHOT_SOURCE_XML
+        if snapshot_is_stale(header, source_xml):
+            logger.warning(
+                "Catalog snapshot %s was not built from %s; import the XML or re-export the snapshot",
+                path, source_xml,
+            )
+            return None
+        result = load_snapshot(db, path)
+        logger.info(
+            "Loaded catalog snapshot %s (%d rows) in %.2fs",
+            path, sum(result["rows"].values()), result["seconds"],
+        )
+        return result
+    except Exception as e:
+        logger.warning("Catalog snapshot %s was not loaded: %s", path, e)
+        return None
+    finally:
+        db.close()
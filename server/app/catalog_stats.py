@@ -0,0 +1,122 @@
+"""
+Row counts and import times of every catalog table.
+All tables are counted by a single UNION ALL query and the result is cached
+until the next write or import marks it stale, so loading the data browser costs
+one cheap request instead of a count query per table. Writes made by the CLI or
+another worker are noticed through :class:`CatalogVersionGuard`.
+"""
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Table, distinct, func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from .catalog_version import CatalogVersionGuard
+from .models import Component, ElementListDb, ImportHistory
+from .xml_parser_service import XmlParserService
+
+
+# Successful imports searched for the last write to each table
+IMPORT_HISTORY_SCAN = 200
+
+
+def stats_tables() -> List[Tuple[Table, str]]:
+    """(table, kind) pairs, grouped like the /families listing plus the general components table."""
+    service = XmlParserService()
+    tables = [(model.__table__, "functional") for model in service.functional_table_mappings.values()]
+    tables += [(model.__table__, "assurance") for model in service.assurance_table_mappings.values()]
+    tables.append((ElementListDb.__table__, "special"))
+    tables.append((Component.__table__, "general"))
+    return tables
+
+
+def _count_query(tables: List[Tuple[Table, str]]):
+    selects = []
+    for table, _ in tables:
+        selects.append(select(
+            literal(str(table.name)).label("table"),
+            func.count().label("rows"),
+            (func.count(distinct(table.c.component)) if "component" in table.c else null()).label("components"),
+            (func.count(distinct(table.c.family)) if "family" in table.c else null()).label("families"),
+        ).select_from(table))
+    return union_all(*selects)
+
+
+def _last_imports(db: Session, table_names: List[str]) -> Dict[str, datetime]:
+    """When each table was last written by a successful import or snapshot load."""
+    last: Dict[str, datetime] = {}
+    pending: Set[str] = set(table_names)
+    catalog = {str(table.name) for table in XmlParserService().catalog_tables()}
+    entries = db.execute(
+        select(ImportHistory.started_at, ImportHistory.timings)
+        .where(ImportHistory.success.is_(True))
+        .order_by(ImportHistory.id.desc())
+        .limit(IMPORT_HISTORY_SCAN)
+    ).all()
+    for started_at, timings in entries:
+        if not pending:
+            break
+        # Snapshot loads record no timings and fill every catalog table
+        written = set(json.loads(timings).get("rows", {})) if timings else catalog
+        for name in pending & written:
+            last[name] = started_at
+        pending -= written
+    return last
+
+
+def collect_stats(db: Session) -> Dict[str, Any]:
+    tables = stats_tables()
+    kinds = {str(table.name): kind for table, kind in tables}
+    rows = db.execute(_count_query(tables)).mappings().all()
+    last_imports = _last_imports(db, list(kinds))
+    entries = [
+        {
+            "table": row["table"],
+            "kind": kinds[row["table"]],
+            "rows": row["rows"],
+            "components": row["components"],
+            "families": row["families"],
+            "last_import_at": last_imports.get(row["table"]),
+        }
+        for row in rows
+    ]
+    return {
+        "tables": entries,
+        "total_rows": sum(entry["rows"] for entry in entries),
+        "last_import_at": max(last_imports.values(), default=None),
+        "generated_at": datetime.now(timezone.utc),
+    }
+
+
+class CatalogStatsCache:
+    """Holds the last :func:`collect_stats` result until it is invalidated or the catalog version moves."""
+
+    def __init__(self):
+        self._stats: Optional[Dict[str, Any]] = None
+        # Bumped by every invalidation so stats collected across a write are not kept
+        self._version = 0
+        self._guard = CatalogVersionGuard()
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._stats = None
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        stats = self._stats
+        if stats is not None and self._guard.is_current(db):
+            return {**stats, "cached": True}
+        with self._lock:
+            if self._stats is not None and self._guard.is_current(db):
+                return {**self._stats, "cached": True}
+            version = self._version
+            self._guard.building(db)
+            stats = collect_stats(db)
+            if version == self._version:
+                self._stats = stats
+            return {**stats, "cached": False}
+
+
+catalog_stats = CatalogStatsCache()
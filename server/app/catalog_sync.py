@@ -0,0 +1,127 @@
+"""
+Incremental catalog synchronisation.
+Imported rows carry a content hash; a re-import only inserts new rows, updates
+rows whose hash changed and deletes imported rows that left the catalog.
+"""
+import hashlib
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table, bindparam, delete, select, update
+from sqlalchemy.orm import Session
+
+from .bulk_writer import BulkRowWriter
+
+
+HASH_FIELD_SEPARATOR = "\x1f"
+# Provenance rather than content: the same catalog imported from another file is unchanged
+HASH_EXCLUDED_COLUMNS = ("content_hash", "source_file")
+DELETE_CHUNK_SIZE = 500
+
+
+def compute_content_hash(row: Dict[str, Any]) -> str:
+    """SHA-256 over the row's identifier, hierarchy labels and text, in column order."""
+    digest = hashlib.sha256()
+    for column in sorted(row):
+        if column in HASH_EXCLUDED_COLUMNS:
+            continue
+        value = row[column]
+        digest.update(column.encode("utf-8"))
+        digest.update(b"=")
+        digest.update(("" if value is None else str(value)).encode("utf-8"))
+        digest.update(HASH_FIELD_SEPARATOR.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class IncrementalCatalogSync:
+    """
+    Collects the rows of an import and reconciles them with the database on flush.
+
+    Exposes the same ``add``/``upsert``/``flush``/``table_stats`` interface as
+    :class:`BulkRowWriter`, so the importer can use either one.
+    """
+
+    def __init__(self, db: Session, tables: Dict[Table, str], batch_size: Optional[int] = None):
+        self.db = db
+        # Table -> column identifying a row across imports
+        self.tables = tables
+        self.writer = BulkRowWriter(db, batch_size=batch_size)
+        self._desired: Dict[str, Dict[Any, Dict[str, Any]]] = {table.name: {} for table in tables}
+        self._keys: Dict[str, str] = {table.name: key for table, key in tables.items()}
+        self.sync_stats: Dict[str, Dict[str, int]] = {}
+
+    def add(self, table: Table, row: Dict[str, Any]) -> None:
+        """Record a desired row keyed on its element id."""
+        self._desired[table.name][row[self._keys[table.name]]] = row
+
+    def upsert(self, table: Table, row: Dict[str, Any], key: str, update_columns: Sequence[str]) -> None:
+        """Record a desired keyed row; the sync decides between insert and update."""
+        self._desired[table.name][row[key]] = row
+
+    def flush(self) -> None:
+        """Diff every catalog table against the collected rows and apply the changes."""
+        for table in self.tables:
+            self._sync_table(table)
+        self.writer.flush()
+
+    def table_stats(self) -> Dict[str, Dict[str, float]]:
+        """Write statistics for the inserted rows."""
+        return self.writer.table_stats()
+
+    def _sync_table(self, table: Table) -> None:
+        key = self._keys[table.name]
+        desired = self._desired.get(table.name, {})
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "skipped": 0}
+
+        # Only imported rows (those with a hash) are matched, updated or deleted; hand-made rows are never touched
+        existing: Dict[Any, tuple] = {}
+        hand_made_keys = set()
+        stale_ids: List[int] = []
+        for row_id, row_key, row_hash in self.db.execute(
+            select(table.c.id, table.c[key], table.c.content_hash).order_by(table.c.id)
+        ):
+            if row_key is None:
+                continue
+            if row_hash is None:
+                hand_made_keys.add(row_key)
+            elif row_key in existing:
+                # Duplicate left behind by an earlier append-only import
+                stale_ids.append(row_id)
+            else:
+                existing[row_key] = (row_id, row_hash)
+
+        # A unique key held by a hand-made row cannot be inserted again, so that row wins
+        unique_key = bool(table.c[key].unique)
+        updates = []
+        for row_key, row in desired.items():
+            match = existing.pop(row_key, None)
+            if match is None:
+                if unique_key and row_key in hand_made_keys:
+                    stats["skipped"] += 1
+                    continue
+                self.writer.add(table, row)
+                stats["inserted"] += 1
+            elif match[1] != row["content_hash"]:
+                updates.append({"_id": match[0], **{f"_{column}": value for column, value in row.items()}})
+                stats["updated"] += 1
+            else:
+                stats["unchanged"] += 1
+
+        # Imported rows that left the catalog
+        stale_ids.extend(row_id for row_id, _ in existing.values())
+
+        if updates:
+            columns = [name[1:] for name in updates[0] if name != "_id"]
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("_id"))
+                .values({column: bindparam(f"_{column}") for column in columns})
+            )
+            self.db.execute(statement, updates)
+
+        for start in range(0, len(stale_ids), DELETE_CHUNK_SIZE):
+            chunk = stale_ids[start:start + DELETE_CHUNK_SIZE]
+            self.db.execute(delete(table).where(table.c.id.in_(chunk)))
+        stats["deleted"] = len(stale_ids)
+
+        if any(stats[name] for name in ("inserted", "updated", "deleted", "skipped")) or desired:
+            self.sync_stats[table.name] = stats
@@ -0,0 +1,78 @@
+"""
+Change detection for in-memory views of the catalog.
+Caches built from the catalog tables (the autocomplete index, the table
+statistics) are dropped by writes made through this process, but imports run by
+the CLI or another worker never reach them. Every catalog write therefore also
+bumps the single ``catalog_revision`` row, which a cache reads by primary key at
+most every few seconds, plus a maximum age that also covers edits made in place
+elsewhere.
+"""
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from .models import CatalogRevision
+
+
+VERSION_CHECK_SECONDS = float(os.getenv("CATALOG_VERSION_CHECK_SECONDS", "2"))
+MAX_AGE_SECONDS = float(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+REVISION_ROW_ID = 1
+
+
+def catalog_revision(db: Session) -> int:
+    """The current catalog revision; 0 before the first write."""
+    return db.execute(
+        select(CatalogRevision.revision).where(CatalogRevision.id == REVISION_ROW_ID)
+    ).scalar() or 0
+
+
+def bump_catalog_revision(db: Session) -> None:
+    """Mark the catalog as changed; call inside the writing transaction, before its commit."""
+    result = db.execute(
+        update(CatalogRevision)
+        .where(CatalogRevision.id == REVISION_ROW_ID)
+        .values(revision=CatalogRevision.revision + 1)
+    )
+    if result.rowcount == 0:
+        db.add(CatalogRevision(id=REVISION_ROW_ID, revision=1))
+
+
+class CatalogVersionGuard:
+    """Tells a cache whether the catalog it was built from may have changed since."""
+
+    def __init__(self, check_seconds: float = VERSION_CHECK_SECONDS, max_age_seconds: float = MAX_AGE_SECONDS):
+        self.check_seconds = check_seconds
+        self.max_age_seconds = max_age_seconds
+        self._revision: Optional[int] = None
+        self._built_at = 0.0
+        self._checked_at = 0.0
+
+    def building(self, db: Session) -> None:
+        """Record the revision a cache is about to be built from; call before reading the catalog."""
+        self._revision = catalog_revision(db)
+        self._built_at = self._checked_at = time.monotonic()
+
+    def needs_check(self) -> bool:
+        """Whether :meth:`is_current` would read the database (or give up) right now."""
+        now = time.monotonic()
+        return (
+            self._revision is None
+            or now - self._built_at > self.max_age_seconds
+            or now - self._checked_at >= self.check_seconds
+        )
+
+    def is_current(self, db: Session) -> bool:
+        now = time.monotonic()
+        if self._revision is None or now - self._built_at > self.max_age_seconds:
+            return False
+        if now - self._checked_at < self.check_seconds:
+            return True
+        self._checked_at = now
+        if catalog_revision(db) != self._revision:
+            # Stays out of date until the next build
+            self._revision = None
+            return False
+        return True
@@ -0,0 +1,119 @@
+"""
+Bounded executors for CPU-heavy request work.
+XML parsing, imports and DOCX generation run here instead of on the asyncio event
+loop, so cheap requests stay responsive while a large job is in progress. Each
+executor admits at most ``max_workers + max_queue`` jobs; beyond that requests are
+rejected with 503 instead of piling up.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class ExecutorSaturated(HTTPException):
+    """Raised when an executor already holds as many jobs as it admits."""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"The {name} executor is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+
+class BoundedExecutor:
+    """A thread or process pool with a cap on queued work and an in-flight counter."""
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: Optional[int] = None, max_queue: int = 0):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind '{kind}'. Expected one of: {', '.join(EXECUTOR_KINDS)}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max(0, max_queue)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._pool: Optional[Executor] = None
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, kind: Optional[str] = None) -> "BoundedExecutor":
+        """Configure from ``<prefix>_KIND``, ``<prefix>_WORKERS`` and ``<prefix>_QUEUE``."""
+        return cls(
+            name,
+            kind=kind or os.getenv(f"{prefix}_KIND", "thread").lower(),
+            max_workers=int(os.getenv(f"{prefix}_WORKERS", "0")) or None,
+            max_queue=int(os.getenv(f"{prefix}_QUEUE", "8")),
+        )
+
+    @property
+    def pool(self) -> Executor:
+        # Created lazily so importing the app never forks worker processes
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn`` in the pool and await its result, or raise ExecutorSaturated."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorSaturated(self.name)
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self.pool, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        else:
+            with self._lock:
+                self.completed += 1
+            return result
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queued": max(0, self.in_flight - self.max_workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+# Pure CPU work (XML parsing, DOCX generation); may be a process pool
+cpu_executor = BoundedExecutor.from_env("cpu", "CPU_EXECUTOR")
+# Work that needs a database session, which cannot leave the process
+db_executor = BoundedExecutor.from_env("database", "DB_EXECUTOR", kind="thread")
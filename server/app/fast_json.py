@@ -0,0 +1,64 @@
+"""
+Fast JSON encoding for large responses.
+Uses orjson when it is installed and falls back to the standard library encoder.
+Objects exposing ``to_json_dict()`` (such as XmlNode) are expanded by the encoder
+itself, so trees are serialized without building an intermediate dict copy.
+"""
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator, Sequence
+
+from fastapi.responses import Response, StreamingResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+# Rows encoded per chunk when streaming arrays
+STREAM_CHUNK_ROWS = 500
+
+
+def _default(obj: Any) -> Any:
+    to_json_dict = getattr(obj, "to_json_dict", None)
+    if to_json_dict is not None:
+        return to_json_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def iter_json_array(rows: Iterable[Sequence[Any]], keys: Sequence[str], chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """Encode row tuples as a JSON array of objects, yielding one chunk of rows at a time."""
+    rows = iter(rows)
+    yield b"["
+    separator = b""
+    while True:
+        chunk = [dict(zip(keys, row)) for row in islice(rows, chunk_rows)]
+        if not chunk:
+            break
+        # Strip the brackets of the encoded chunk so the pieces form a single array
+        yield separator + dumps(chunk)[1:-1]
+        separator = b","
+    yield b"]"
+
+
+class FastJSONResponse(Response):
+    """JSONResponse counterpart that encodes with :func:`dumps`."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def streaming_json_array(rows: Iterable[Sequence[Any]], keys: Sequence[str]) -> StreamingResponse:
+    """Stream rows as a JSON array of objects keyed by ``keys``."""
+    return StreamingResponse(iter_json_array(rows, keys), media_type="application/json")
@@ -0,0 +1,252 @@
+"""
+Full-text search over the catalog tables.
+On PostgreSQL every searchable table gets a generated, weighted ``search_vector``
+tsvector column with a GIN index; on SQLite an FTS5 external-content table kept
+in sync by triggers. Both are maintained by the database itself, so imports, the
+staged swap, snapshot loads and CRUD edits never touch them. Every query term is
+matched as a word prefix, hits are ranked and carry a highlighted snippet.
+Substring (ILIKE) matching stays available, and is used wherever no index exists.
+"""
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Table, column, func, inspect, literal, literal_column, null, or_, select, table as table_clause, text, union_all,
+)
+
+from .models import Component, ElementListDb
+from .xml_parser_service import XmlParserService
+
+
+SEARCH_MODES = ("fulltext", "substring")
+SEARCH_KINDS = ("all", "functional", "assurance")
+SEARCH_MODE_DESCRIPTION = (
+    "fulltext: ranked word-prefix search with highlighted snippets; "
+    "substring: match q anywhere in the text (ILIKE)"
+)
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+
+# Searchable columns and their weight: identifiers first, then names, then requirement text
+COLUMN_WEIGHTS = {
+    "element": "A", "element_index": "A", "component": "A",
+    "class": "B", "class_name": "B", "family": "B", "component_name": "B",
+    "element_item": "C", "item_list": "C",
+}
+# bm25() column weights on SQLite for the same classes
+BM25_WEIGHTS = {"A": 10.0, "B": 4.0, "C": 1.0}
+# Text shown in snippets, most descriptive column first
+SNIPPET_COLUMNS = ("element_item", "item_list", "component_name")
+
+PG_TEXT_CONFIG = "english"
+SEARCH_VECTOR = "search_vector"
+FTS_SUFFIX = "_fts"
+
+TERM_RE = re.compile(r"\w[\w.]*")
+
+# Tables whose index was found or created by ensure_search_indexes
+_indexed_tables: Set[str] = set()
+
+
+def searchable_tables() -> List[Table]:
+    """Every family table, components and element_list_db."""
+    tables = [table for table in XmlParserService().catalog_tables() if table.name != ElementListDb.__tablename__]
+    return tables + [Component.__table__, ElementListDb.__table__]
+
+
+def search_columns(table: Table) -> List[Tuple[str, str]]:
+    """(column, weight) pairs of ``table`` in table order."""
+    return [(column.name, COLUMN_WEIGHTS[column.name]) for column in table.columns if column.name in COLUMN_WEIGHTS]
+
+
+def query_terms(q: str) -> List[str]:
+    """Words of a search string; dots are kept so ids like ``fau_gen.1`` stay one term."""
+    return [term.rstrip(".") for term in TERM_RE.findall(q)]
+
+
+def ensure_search_indexes(bind) -> None:
+    """Create the full-text columns, indexes, FTS tables and triggers that are missing."""
+    dialect = bind.dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        return
+    preparer = bind.dialect.identifier_preparer
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in searchable_tables():
+            if not inspector.has_table(table.name):
+                continue
+            if dialect == "postgresql":
+                _ensure_search_vector(conn, inspector, preparer, table)
+            elif not _ensure_fts_table(conn, preparer, table):
+                continue
+            _indexed_tables.add(table.name)
+
+
+def _ensure_search_vector(conn, inspector, preparer, table: Table) -> None:
+    table_sql = preparer.format_table(table)
+    if SEARCH_VECTOR not in {column["name"] for column in inspector.get_columns(table.name)}:
+        vector = " || ".join(
+            f"setweight(to_tsvector('{PG_TEXT_CONFIG}', coalesce({preparer.quote(name)}, '')), '{weight}')"
+            for name, weight in search_columns(table)
+        )
+        conn.execute(text(
+            f"ALTER TABLE {table_sql} ADD COLUMN {SEARCH_VECTOR} tsvector GENERATED ALWAYS AS ({vector}) STORED"
+        ))
+    conn.execute(text(
+        f"CREATE INDEX IF NOT EXISTS {preparer.quote(f'ix_{table.name}_{SEARCH_VECTOR}')} "
+        f"ON {table_sql} USING GIN ({SEARCH_VECTOR})"
+    ))
+
+
+def _ensure_fts_table(conn, preparer, table: Table) -> bool:
+    """Create the FTS5 table and its triggers; False when SQLite was built without FTS5."""
+    fts_name = f"{table.name}{FTS_SUFFIX}"
+    exists = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts_name}
+    ).first() is not None
+    table_sql = preparer.format_table(table)
+    fts_sql = preparer.quote(fts_name)
+    names = [preparer.quote(name) for name, _ in search_columns(table)]
+    columns = ", ".join(names)
+    new_values = ", ".join(f"new.{name}" for name in names)
+    old_values = ", ".join(f"old.{name}" for name in names)
+    if not exists:
+        try:
+            conn.execute(text(
+                f"CREATE VIRTUAL TABLE {fts_sql} USING fts5({columns}, "
+                f"content={table_sql}, content_rowid='id', tokenize='porter unicode61')"
+            ))
+        except Exception:
+            # "no such module: fts5"; substring search keeps working
+            return False
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {preparer.quote(fts_name + '_ai')} AFTER INSERT ON {table_sql} BEGIN "
+        f"INSERT INTO {fts_sql}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {preparer.quote(fts_name + '_ad')} AFTER DELETE ON {table_sql} BEGIN "
+        f"INSERT INTO {fts_sql}({fts_sql}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    conn.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {preparer.quote(fts_name + '_au')} AFTER UPDATE ON {table_sql} BEGIN "
+        f"INSERT INTO {fts_sql}({fts_sql}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_sql}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+    ))
+    if not exists:
+        # Index the rows that were there before the FTS table
+        conn.execute(text(f"INSERT INTO {fts_sql}({fts_sql}) VALUES ('rebuild')"))
+    return True
+
+
+class TextMatch(NamedTuple):
+    """How one table matches a search string."""
+    where: Any
+    # Higher is better; None for substring matching, which is unranked
+    rank: Any
+    snippet: Any
+    # FTS5 table to join on rowid = id (SQLite only)
+    fts_table: Optional[Any] = None
+
+
+def text_match(table: Table, q: str, mode: str, dialect_name: str) -> TextMatch:
+    """Full-text match of ``q`` on ``table``, or a substring match when requested or unavailable."""
+    terms = query_terms(q)
+    if mode == "substring" or not terms or table.name not in _indexed_tables:
+        like = f"%{q}%"
+        return TextMatch(or_(*(table.c[name].ilike(like) for name, _ in search_columns(table))), None, None)
+
+    snippet_source = next(name for name in SNIPPET_COLUMNS if name in table.c)
+    if dialect_name == "postgresql":
+        config = literal_column(f"'{PG_TEXT_CONFIG}'::regconfig")
+        tsquery = func.to_tsquery(config, " & ".join(f"{term}:*" for term in terms))
+        vector = literal_column(f"{table.name}.{SEARCH_VECTOR}")
+        snippet = func.ts_headline(
+            config,
+            func.coalesce(table.c[snippet_source], ""),
+            tsquery,
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords=30, MinWords=12",
+        )
+        return TextMatch(vector.op("@@")(tsquery), func.ts_rank_cd(vector, tsquery), snippet)
+
+    fts_table = table_clause(f"{table.name}{FTS_SUFFIX}", column("rowid"))
+    fts = literal_column(fts_table.name)
+    match = " ".join(f'"{term}"*' for term in terms)
+    weights = [BM25_WEIGHTS[weight] for _, weight in search_columns(table)]
+    snippet_column = [name for name, _ in search_columns(table)].index(snippet_source)
+    return TextMatch(
+        fts.op("MATCH")(match),
+        # bm25() is lower for better matches
+        -func.bm25(fts, *weights),
+        func.snippet(fts, snippet_column, HIGHLIGHT_START, HIGHLIGHT_END, "…", 24),
+        fts_table,
+    )
+
+
+def apply_text_search(query, table: Table, q: Optional[str], mode: str = "fulltext") -> Tuple[Any, List[Any]]:
+    """
+    Filter an ORM query on ``table`` by the search string ``q``.
+
+    Full-text matches are ordered by relevance (ties by id). Returns the filtered
+    query and the extra labelled ``snippet`` and ``rank`` columns to select, which
+    are empty for substring matching.
+    """
+    if not q:
+        return query, []
+    match = text_match(table, q, mode, query.session.get_bind().dialect.name)
+    if match.fts_table is not None:
+        query = query.join(match.fts_table, match.fts_table.c.rowid == table.c.id)
+    query = query.filter(match.where)
+    if match.rank is None:
+        return query, []
+    rank = match.rank.label("rank")
+    query = query.order_by(None).order_by(rank.desc(), table.c.id)
+    return query, [match.snippet.label("snippet"), rank]
+
+
+def search_kind_tables(kind: str) -> List[Tuple[Table, str]]:
+    """(table, kind) pairs searched for ``kind``; element lists belong to functional requirements."""
+    service = XmlParserService()
+    tables = []
+    if kind in ("all", "functional"):
+        tables.extend((model.__table__, "functional") for model in service.functional_table_mappings.values())
+        tables.append((ElementListDb.__table__, "functional"))
+    if kind in ("all", "assurance"):
+        tables.extend((model.__table__, "assurance") for model in service.assurance_table_mappings.values())
+    return tables
+
+
+def catalog_search(db, q: str, kind: str = "all", mode: str = "fulltext", skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    Search every catalog table of ``kind`` with a single UNION ALL query.
+
+    Each branch probes its own table's index. Hits are ordered by rank, then by
+    table and id; ``limit`` rows are returned from ``skip`` on.
+    """
+    dialect_name = db.get_bind().dialect.name
+    selects = []
+    for table, table_kind in search_kind_tables(kind):
+        match = text_match(table, q, mode, dialect_name)
+        source = table
+        if match.fts_table is not None:
+            source = table.join(match.fts_table, match.fts_table.c.rowid == table.c.id)
+        element_list = "item_list" in table.c
+        selects.append(
+            select(
+                literal(table.name).label("table"),
+                literal(table_kind).label("kind"),
+                table.c.id.label("id"),
+                table.c.element.label("element"),
+                (table.c.element_index if element_list else null()).label("element_index"),
+                (null() if element_list else table.c.component).label("component"),
+                (null() if element_list else table.c.component_name).label("component_name"),
+                (table.c.item_list if element_list else table.c.element_item).label("text"),
+                (null() if match.rank is None else match.snippet).label("snippet"),
+                (literal(0.0) if match.rank is None else match.rank).label("rank"),
+            )
+            .select_from(source)
+            .where(match.where)
+        )
+    union = union_all(*selects)
+    columns = union.selected_columns
+    statement = union.order_by(columns.rank.desc(), columns.table, columns.id).offset(skip).limit(limit)
+    return [dict(row) for row in db.execute(statement).mappings()]
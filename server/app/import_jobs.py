@@ -0,0 +1,167 @@
+"""
+Background XML import jobs.
+Uploads are spooled to disk and imported by an in-process worker pool, so the
+request returns immediately and clients poll (or subscribe to) the job's progress.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from .xml_sources import import_catalog
+
+
+JOB_WORKERS = int(os.getenv("XML_IMPORT_JOB_WORKERS", "1"))
+# Finished jobs kept around for status queries
+JOB_HISTORY = int(os.getenv("XML_IMPORT_JOB_HISTORY", "50"))
+JOB_SPOOL_DIR = Path(os.getenv("XML_IMPORT_JOB_DIR", Path(tempfile.gettempdir()) / "ccgentool2_import_jobs"))
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class ImportJob:
+    """State of one background import, updated by the worker thread."""
+
+    def __init__(self, filename: str, options: Dict[str, bool]):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.options = options
+        self.status = "queued"
+        self.phase = "queued"
+        self.rows_processed: Dict[str, int] = {}
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        # Bumped on every change so event streams only send real updates
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def update(self, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(self, name, value)
+            self.version += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            if self.started_at is None:
+                elapsed = 0.0
+            else:
+                elapsed = (self.finished_at or time.time()) - self.started_at
+            return {
+                "id": self.id,
+                "filename": self.filename,
+                "status": self.status,
+                "phase": self.phase,
+                "options": dict(self.options),
+                "rows_processed": dict(self.rows_processed),
+                "total_rows_processed": sum(self.rows_processed.values()),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "elapsed_seconds": round(elapsed, 3),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class ImportJobManager:
+    """Runs imports on a small thread pool and keeps a bounded history of jobs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_workers: int = JOB_WORKERS,
+        history: int = JOB_HISTORY,
+        spool_dir: Path = JOB_SPOOL_DIR,
+        on_completed: Optional[Callable[[], None]] = None,
+    ):
+        self.session_factory = session_factory
+        # Called after every successful import, e.g. to refresh in-memory indexes
+        self.on_completed = on_completed
+        self.history = history
+        self.spool_dir = Path(spool_dir)
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="xml-import")
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, upload: BinaryIO, filename: str, **options: bool) -> ImportJob:
+        """Spool the upload to disk and queue its import."""
+        handle, spool_name = tempfile.mkstemp(dir=self.spool_dir, suffix=".upload")
+        with os.fdopen(handle, "wb") as spool_file:
+            shutil.copyfileobj(upload, spool_file)
+
+        job = ImportJob(filename, options)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, Path(spool_name))
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def recent(self) -> List[ImportJob]:
+        """Known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts per status."""
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: ImportJob, spool_path: Path) -> None:
+        job.update(status="running", phase="parsing", started_at=time.time())
+
+        def report(phase: str, rows_processed: Dict[str, int]) -> None:
+            job.update(phase=phase, rows_processed=dict(rows_processed))
+
+        db = self.session_factory()
+        try:
+            result = import_catalog(
+                spool_path,
+                job.filename,
+                db,
+                stream=job.options.get("stream", False),
+                incremental=job.options.get("incremental", False),
+                parallel=job.options.get("parallel", False),
+                staged=job.options.get("replace", False),
+                progress=report,
+            )
+            if self.on_completed is not None:
+                self.on_completed()
+            job.update(status="completed", phase="completed", result=result, finished_at=time.time())
+        except Exception as e:
+            db.rollback()
+            job.update(status="failed", phase="failed", error=str(e), finished_at=time.time())
+        finally:
+            db.close()
+            spool_path.unlink(missing_ok=True)
@@ -0,0 +1,56 @@
+"""
+Per-phase wall clock accounting for catalog imports.
+Phases may nest: while an inner phase runs, the outer one is paused, so every
+second is charged to exactly one phase and the phase totals add up to the run.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, TypeVar
+
+
+T = TypeVar("T")
+
+
+class PhaseTimer:
+    """Accumulates exclusive seconds per named phase."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._stack: List[str] = []
+        self._mark = self.started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._switch()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch()
+            self._stack.pop()
+
+    def iterate(self, iterable: Iterable[T], name: str) -> Iterator[T]:
+        """Yield from ``iterable``, charging the time spent producing each item to ``name``."""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def get(self, name: str) -> float:
+        return self.seconds.get(name, 0.0)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def _switch(self) -> None:
+        # Charge the time since the last switch to the phase that was running
+        now = time.perf_counter()
+        if self._stack:
+            name = self._stack[-1]
+            self.seconds[name] = self.seconds.get(name, 0.0) + now - self._mark
+        self._mark = now
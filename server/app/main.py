@@ -1,5 +1,8 @@
 import os
+import asyncio
 import base64
+import gzip
+import json
 import re
 import shutil
 import tempfile
@@ -11,28 +14,46 @@ from io import BytesIO
 from pathlib import Path
 from typing import List, Optional
 
-from fastapi import FastAPI, Depends, HTTPException, Query, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import null, text
 
 from docx import Document
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.shared import Mm, Pt, RGBColor
 from lxml import html as lxml_html
 
-from .database import Base, engine, get_db
+from .autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_LIMIT, MAX_LIMIT as AUTOCOMPLETE_MAX_LIMIT, autocomplete_index
+from .catalog_snapshot import bootstrap_catalog
+from .catalog_stats import catalog_stats
+from .catalog_version import bump_catalog_revision
+from .database import Base, SessionLocal, add_missing_columns, engine, get_db
 from .models import (
     Component, FauDb, FcoDb, FcsDb, FdpDb, FiaDb, FmtDb, FprDb, FptDb, FruDb, FtaDb, FtpDb,
-    AcoDb, AdvDb, AgdDb, AlcDb, ApeDb, AseDb, AteDb, AvaDb, ElementListDb
+    AcoDb, AdvDb, AgdDb, AlcDb, ApeDb, AseDb, AteDb, AvaDb, ElementListDb, ImportHistory
 )
 from .schemas import (
     ComponentCreate, ComponentOut, ComponentUpdate, XmlParseResponse, XmlImportResponse,
-    ComponentFamilyOut, ElementListOut
+    AutocompleteSuggestion, CatalogStatsResponse, ComponentFamilyOut, ElementListOut, ImportHistoryOut, SearchResponse, XmlImportJobOut,
+    XmlTreeChildrenResponse, XmlTreeResponse
 )
+from .executors import cpu_executor, db_executor
+from .fast_json import FastJSONResponse, dumps as fast_json_dumps, streaming_json_array
+from .full_text import (
+    SEARCH_KINDS, SEARCH_MODE_DESCRIPTION, SEARCH_MODES, apply_text_search, catalog_search, ensure_search_indexes,
+)
+from .import_jobs import ImportJobManager
+from .pagination import (
+    NEXT_CURSOR_HEADER, PAGINATION_HEADERS, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER, TOTAL_MODES, PageParams,
+    apply_sort, count_rows, decode_cursor, encode_cursor, keyset_filter, sort_keys,
+)
+from .parse_cache import DEFAULT_COMPRESSLEVEL, compress_payload, parse_cache, xml_digest
+from .tree_cache import ParsedTree, children_page, node_summary, tree_cache
 from .xml_parser_service import XmlParserService
+from .xml_sources import CATALOG_SUFFIX_HINT, catalog_format, import_catalog, open_catalog_sources
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -40,12 +61,33 @@ from pydantic import BaseModel, Field, ConfigDict
 async def lifespan(app: FastAPI):
     # Startup
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    ensure_search_indexes(engine)
+    # An empty database gets the prebuilt catalog instead of waiting for an XML import
+    bootstrap_catalog(SessionLocal)
+    db = SessionLocal()
+    try:
+        autocomplete_index.rebuild(db)
+    finally:
+        db.close()
     yield
     # Shutdown (if needed)
+    import_jobs.shutdown()
+    cpu_executor.shutdown()
+    db_executor.shutdown()
 
 
 app = FastAPI(title="CCGenTool2 API", lifespan=lifespan)
 
+
+def _catalog_changed() -> None:
+    """Drop the in-memory views of the catalog after a write or import."""
+    autocomplete_index.invalidate()
+    catalog_stats.invalidate()
+
+
+import_jobs = ImportJobManager(SessionLocal, on_completed=_catalog_changed)
+
 COVER_UPLOAD_ROOT = Path(os.getenv("COVER_UPLOAD_DIR", Path(tempfile.gettempdir()) / "ccgentool2_cover_uploads"))
 COVER_UPLOAD_ROOT.mkdir(parents=True, exist_ok=True)
 COVER_DOCX_ROOT = Path(os.getenv("COVER_DOCX_DIR", Path(tempfile.gettempdir()) / "ccgentool2_cover_docx"))
@@ -63,6 +105,13 @@ FINAL_DOCX_ROOT.mkdir(parents=True, exist_ok=True)
 
 USER_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
 
+# Default for the ?fast= switch of the large list/parse endpoints
+FAST_JSON_DEFAULT = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+FAST_JSON_DESCRIPTION = "Encode straight from internal data with the fastest available JSON encoder"
+REPLACE_DESCRIPTION = (
+    "Replace the whole catalog: load it into staging tables and swap them in once the import succeeded"
+)
+
 
 def get_user_upload_dir(user_id: str, *, create: bool = False) -> Path:
     if not USER_ID_PATTERN.match(user_id):
@@ -1067,6 +1116,8 @@ cors_kwargs = dict(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the browser client read the cursor and total of paginated lists
+    expose_headers=PAGINATION_HEADERS,
 )
 
 if origin_regex:
@@ -1108,31 +1159,26 @@ def health(db: Session = Depends(get_db)):
         "database_url": os.getenv("DATABASE_URL", "unset"),
         "timestamp": int(time.time()),
         "details": details,
+        "executors": {
+            "cpu": cpu_executor.stats(),
+            "database": db_executor.stats(),
+            "import_jobs": import_jobs.stats(),
+        },
+        "autocomplete": autocomplete_index.stats(),
     }
 
 
 # CRUD endpoints
 @app.get("/components", response_model=List[ComponentOut])
 def list_components(
+    response: Response,
     q: Optional[str] = Query(None, description="Search across select fields"),
-    skip: int = 0,
-    limit: int = 100,
+    match: str = Query("fulltext", description=SEARCH_MODE_DESCRIPTION),
+    page: PageParams = Depends(),
     db: Session = Depends(get_db),
 ):
-    query = db.query(Component)
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            (
-                (Component.class_name.ilike(like))
-                | (Component.family.ilike(like))
-                | (Component.component.ilike(like))
-                | (Component.component_name.ilike(like))
-                | (Component.element.ilike(like))
-                | (Component.element_item.ilike(like))
-            )
-        )
-    return query.offset(skip).limit(limit).all()
+    query, search_columns = _search(db.query(Component), Component, q, match)
+    return _list_page(response, query, Component, q, search_columns, page)
 
 
 @app.post("/components", response_model=ComponentOut, status_code=201)
@@ -1146,7 +1192,9 @@ def create_component(payload: ComponentCreate, db: Session = Depends(get_db)):
         element_item=payload.element_item,
     )
     db.add(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     db.refresh(item)
     return item
 
@@ -1171,7 +1219,9 @@ def update_component(item_id: int, payload: ComponentUpdate, db: Session = Depen
     for k, v in data.items():
         setattr(item, k, v)
     db.add(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     db.refresh(item)
     return item
 
@@ -1182,57 +1232,284 @@ def delete_component(item_id: int, db: Session = Depends(get_db)):
     if not item:
         raise HTTPException(status_code=404, detail="Not found")
     db.delete(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     return None
 
 
 # XML Parser endpoints
 @app.post("/xml/parse", response_model=XmlParseResponse)
-async def parse_xml_file(file: UploadFile = File(...)):
+async def parse_xml_file(
+    request: Request,
+    file: UploadFile = File(...),
+    parallel: bool = Query(False, description="Extract each f-class/a-class in a separate worker process"),
+    fast: bool = Query(FAST_JSON_DEFAULT, description=FAST_JSON_DESCRIPTION),
+):
     """Parse an uploaded XML file and return the structured data."""
-    if not file.filename or not file.filename.lower().endswith('.xml'):
-        raise HTTPException(status_code=400, detail="File must be an XML file")
+    if catalog_format(file.filename) is None:
+        raise HTTPException(status_code=400, detail=f"File must be an XML file ({CATALOG_SUFFIX_HINT})")
     
     try:
-        content = await file.read()
-        xml_content = content.decode('utf-8')
-        
-        parser = XmlParserService()
-        result = parser.parse_xml_file(xml_content)
-        
-        return XmlParseResponse(**result)
+        digest = await asyncio.to_thread(xml_digest, file.file)
+        payload = await asyncio.to_thread(parse_cache.get, digest)
+        cache_status = "hit"
+        if payload is None:
+            source = await _cpu_upload_source(file)
+            payload = await cpu_executor.run(
+                _parse_upload, source, file.filename, parallel, fast, parse_cache.compresslevel
+            )
+            # Stored here rather than in the worker so the cache counters stay in this process
+            await asyncio.to_thread(parse_cache.store, digest, payload)
+            cache_status = "miss"
+
+        return await _parse_cache_response(request, payload, digest, cache_status)
     
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be valid UTF-8 encoded XML")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing XML: {str(e)}")
 
 
+async def _cpu_upload_source(file: UploadFile):
+    """The spooled upload for lxml to read in place; worker processes need its bytes instead."""
+    await file.seek(0)
+    if cpu_executor.kind == "process":
+        return await file.read()
+    return file.file
+
+
+def _parse_upload(
+    upload, filename: str, parallel: bool, fast: bool = False, compresslevel: int = DEFAULT_COMPRESSLEVEL
+) -> bytes:
+    """Parse an upload into its gzip-compressed response body; runs on the CPU executor."""
+    parser = XmlParserService()
+    with open_catalog_sources(upload, filename) as documents:
+        if fast:
+            # Trusted internal data: encode the node tree directly and skip model validation
+            root_node, components = parser.parse_catalog(documents, parallel=parallel)
+            body = fast_json_dumps({
+                'success': True,
+                'message': None,
+                'data': root_node,
+                'components': [record._asdict() for record in components],
+            })
+        else:
+            result = parser.parse_xml_file(documents, parallel=parallel)
+            body = XmlParseResponse(**result).model_dump_json().encode('utf-8')
+    return compress_payload(body, compresslevel)
+
+
+async def _parse_cache_response(request: Request, payload: bytes, digest: str, cache_status: str) -> Response:
+    """Serve the gzip payload as-is when the client accepts it, otherwise inflate it."""
+    headers = {"X-Parse-Cache": cache_status, "X-Xml-Digest": digest, "Vary": "Accept-Encoding"}
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload, media_type="application/json", headers=headers)
+    body = await asyncio.to_thread(gzip.decompress, payload)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/xml/parse/cache")
+def get_parse_cache_stats():
+    """Hit/miss counters and disk usage of the parse result cache."""
+    return parse_cache.stats()
+
+
+@app.delete("/xml/parse/cache")
+def clear_parse_cache():
+    parse_cache.clear()
+    return {"message": "Parse cache cleared"}
+
+
+@app.post("/xml/tree", response_model=XmlTreeResponse)
+async def parse_xml_tree(file: UploadFile = File(...)):
+    """Parse an XML file into the server-side tree cache and return a handle for lazy browsing."""
+    if catalog_format(file.filename) is None:
+        raise HTTPException(status_code=400, detail=f"File must be an XML file ({CATALOG_SUFFIX_HINT})")
+
+    try:
+        handle = await asyncio.to_thread(xml_digest, file.file)
+        tree = tree_cache.get(handle)
+        if tree is None:
+            source = await _cpu_upload_source(file)
+            tree = tree_cache.put(handle, await cpu_executor.run(_parse_tree, source, file.filename))
+
+        return {
+            "success": True,
+            "handle": handle,
+            "expires_in_seconds": tree_cache.ttl_seconds,
+            "root": node_summary(tree.root, ""),
+            "components": tree.components,
+        }
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error parsing XML: {str(e)}")
+
+
+def _parse_tree(upload, filename: str) -> ParsedTree:
+    """Build the display tree and component list of an upload; runs on the CPU executor."""
+    with open_catalog_sources(upload, filename) as documents:
+        root_node, components = XmlParserService().parse_catalog(documents)
+    return ParsedTree(root_node, [record._asdict() for record in components])
+
+
+@app.get("/xml/tree/{handle}/nodes", response_model=XmlTreeChildrenResponse)
+@app.get("/xml/tree/{handle}/nodes/{path:path}", response_model=XmlTreeChildrenResponse)
+def get_xml_tree_nodes(
+    handle: str,
+    path: str = "",
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Direct children of the node at ``path`` (child indexes joined by '/'), one page at a time."""
+    tree = tree_cache.get(handle)
+    if tree is None:
+        raise HTTPException(status_code=404, detail="Tree handle not found or expired; parse the file again")
+
+    path = path.strip("/")
+    node = tree.resolve(path)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"No node at path '{path}'")
+
+    children, total = children_page(node, path, offset, limit)
+    return {
+        "handle": handle,
+        "node": node_summary(node, path),
+        "offset": offset,
+        "limit": limit,
+        "total": total,
+        "children": children,
+    }
+
+
+@app.delete("/xml/tree/{handle}")
+def release_xml_tree(handle: str):
+    if not tree_cache.discard(handle):
+        raise HTTPException(status_code=404, detail="Tree handle not found or expired")
+    return {"message": "Tree released"}
+
+
 @app.post("/xml/import", response_model=XmlImportResponse)
-async def import_xml_to_database(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def import_xml_to_database(
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream the upload through iterparse instead of loading the whole tree"),
+    incremental: bool = Query(False, description="Only apply rows whose content hash changed and drop vanished ones"),
+    parallel: bool = Query(False, description="Extract each f-class/a-class in a separate worker process"),
+    replace: bool = Query(False, description=REPLACE_DESCRIPTION),
+    db: Session = Depends(get_db),
+):
     """Parse an XML file and import components to the database using family-specific tables."""
-    if not file.filename or not file.filename.lower().endswith('.xml'):
-        raise HTTPException(status_code=400, detail="File must be an XML file")
+    if catalog_format(file.filename) is None:
+        raise HTTPException(status_code=400, detail=f"File must be an XML file ({CATALOG_SUFFIX_HINT})")
+    if replace and incremental:
+        raise HTTPException(status_code=400, detail="Choose either replace or incremental, not both")
     
     try:
-        content = await file.read()
-        xml_content = content.decode('utf-8')
-        
-        parser = XmlParserService()
-        result = parser.import_to_database(xml_content, db)
+        # Hand the spooled upload straight to lxml; the database executor always runs threads
+        await file.seek(0)
+        if stream:
+            result = await db_executor.run(
+                import_catalog, file.file, file.filename, db, stream=True, incremental=incremental, staged=replace
+            )
+        else:
+            result = await db_executor.run(
+                import_catalog, file.file, file.filename, db,
+                incremental=incremental, parallel=parallel, staged=replace,
+            )
+        _catalog_changed()
         
         return XmlImportResponse(**result)
     
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be valid UTF-8 encoded XML")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing XML: {str(e)}")
 
 
+@app.get("/xml/import/history", response_model=List[ImportHistoryOut])
+def list_import_history(limit: int = Query(50, ge=1, le=500), db: Session = Depends(get_db)):
+    """Most recent import runs with their phase timings, newest first."""
+    entries = db.query(ImportHistory).order_by(ImportHistory.id.desc()).limit(limit).all()
+    return [
+        {
+            **{column.name: getattr(entry, column.name) for column in ImportHistory.__table__.columns},
+            "timings": json.loads(entry.timings) if entry.timings else None,
+        }
+        for entry in entries
+    ]
+
+
+@app.post("/xml/import/jobs", response_model=XmlImportJobOut, status_code=202)
+async def create_import_job(
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Stream the upload through iterparse instead of loading the whole tree"),
+    incremental: bool = Query(False, description="Only apply rows whose content hash changed and drop vanished ones"),
+    parallel: bool = Query(False, description="Extract each f-class/a-class in a separate worker process"),
+    replace: bool = Query(False, description=REPLACE_DESCRIPTION),
+):
+    """Queue an XML import in the background and return the job to poll."""
+    if catalog_format(file.filename) is None:
+        raise HTTPException(status_code=400, detail=f"File must be an XML file ({CATALOG_SUFFIX_HINT})")
+    if replace and incremental:
+        raise HTTPException(status_code=400, detail="Choose either replace or incremental, not both")
+
+    await file.seek(0)
+    # Spooling copies the whole upload; keep that off the event loop serving progress streams
+    job = await asyncio.to_thread(
+        import_jobs.submit,
+        file.file, file.filename, stream=stream, incremental=incremental, parallel=parallel, replace=replace,
+    )
+    return job.snapshot()
+
+
+@app.get("/xml/import/jobs", response_model=List[XmlImportJobOut])
+def list_import_jobs():
+    return [job.snapshot() for job in import_jobs.recent()]
+
+
+@app.get("/xml/import/jobs/{job_id}", response_model=XmlImportJobOut)
+def get_import_job(job_id: str):
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.snapshot()
+
+
+@app.get("/xml/import/jobs/{job_id}/events")
+async def stream_import_job(job_id: str):
+    """Server-sent events with the job state on every change, until it finishes."""
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    async def events():
+        sent_version = -1
+        while True:
+            if job.version != sent_version:
+                sent_version = job.version
+                snapshot = job.snapshot()
+                yield f"event: progress\ndata: {json.dumps(snapshot)}\n\n"
+                if snapshot["status"] in ("completed", "failed"):
+                    yield f"event: done\ndata: {json.dumps({'status': snapshot['status']})}\n\n"
+                    return
+            await asyncio.sleep(0.25)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # Family Table Endpoints
 @app.get("/families")
 def list_family_tables():
@@ -1268,6 +1545,12 @@ def list_family_tables():
     return tables
 
 
+@app.get("/families/stats", response_model=CatalogStatsResponse)
+def family_table_stats(db: Session = Depends(get_db)):
+    """Row, component and family counts plus the last import of every table, cached until the next write."""
+    return catalog_stats.get(db)
+
+
 def get_family_table_model(table_name: str):
     """Get the SQLAlchemy model for a family table."""
     table_models = {
@@ -1281,58 +1564,185 @@ def get_family_table_model(table_name: str):
     return table_models.get(table_name)
 
 
+# Response keys of ComponentFamilyOut/ElementListOut, mapped to model attributes
+FAMILY_JSON_FIELDS = (
+    ("class", "class_field"), ("family", "family"), ("component", "component"),
+    ("component_name", "component_name"), ("element", "element"), ("element_item", "element_item"), ("id", "id"),
+    ("source_file", "source_file"),
+)
+ELEMENT_LIST_JSON_FIELDS = (
+    ("element", "element"), ("element_index", "element_index"), ("item_list", "item_list"),
+    ("color", "color"), ("id", "id"), ("source_file", "source_file"),
+)
+
+
+def _list_page(response: Response, query, model, q: Optional[str], search_columns, page: PageParams, fields=None):
+    """
+    Fetch one page of a list query and set its pagination headers.
+
+    Pages are sorted by ``page.sort`` (or the cursor's sort) and continue after
+    the cursor; ranked full-text results without a sort keep their relevance
+    order and page by ``skip`` only. With ``fields`` only those columns are
+    fetched, as tuples streamed as a JSON array.
+    """
+    table = model.__table__
+    if page.total not in TOTAL_MODES:
+        raise HTTPException(status_code=400, detail=f"total must be one of: {', '.join(TOTAL_MODES)}")
+    sort, after = page.sort, None
+    try:
+        if page.cursor:
+            cursor_sort, after = decode_cursor(page.cursor)
+            if sort is not None and sort != cursor_sort:
+                raise ValueError(f"The cursor continues sort={cursor_sort}; drop sort or start without a cursor")
+            sort = cursor_sort
+        if sort is None and not search_columns:
+            sort = "id"
+        keys = sort_keys(table, sort) if sort is not None else []
+        after_filter = None if after is None else keyset_filter(keys, after, query.session.get_bind().dialect.name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = {}
+    if page.total != "none":
+        # Counts every match, not only the rows after the cursor
+        total, estimated = count_rows(query, table, bool(q), page.total)
+        headers[TOTAL_COUNT_HEADER] = str(total)
+        headers[TOTAL_ESTIMATED_HEADER] = "true" if estimated else "false"
+    if keys:
+        query = apply_sort(query, keys)
+    if after_filter is not None:
+        query = query.filter(after_filter)
+    else:
+        query = query.offset(page.skip)
+    # One extra row tells whether there is a next page
+    query = query.limit(page.limit + 1)
+
+    if fields is not None:
+        columns = [getattr(model, attribute, null()).label(key) for key, attribute in fields]
+        columns.extend(search_columns)
+        # Rows are fetched here: the session is closed before the response body is sent
+        rows = query.with_entities(*columns).all()
+    else:
+        rows = _search_results(query, search_columns)
+    has_more = len(rows) > page.limit
+    rows = rows[:page.limit]
+    if has_more and keys and rows:
+        if fields is not None:
+            # Response keys are the column names
+            last = [rows[-1]._mapping[key.column.name] for key in keys]
+        else:
+            last = [getattr(rows[-1], model.__mapper__.get_property_by_column(key.column).key) for key in keys]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(sort, last)
+
+    if fields is not None:
+        streamed = streaming_json_array(rows, [column.key for column in columns])
+        streamed.headers.update(headers)
+        return streamed
+    response.headers.update(headers)
+    return rows
+
+
+def _search(query, model, q: Optional[str], match: str):
+    """Apply a ``q`` filter; returns the query and the snippet/rank columns of full-text matches."""
+    if match not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"match must be one of: {', '.join(SEARCH_MODES)}")
+    return apply_text_search(query, model.__table__, q, match)
+
+
+def _search_results(query, search_columns) -> list:
+    """Load the ORM rows, attaching the snippet and rank of full-text matches to each."""
+    if not search_columns:
+        return query.all()
+    items = []
+    for item, snippet, rank in query.add_columns(*search_columns).all():
+        item.snippet = snippet
+        item.rank = rank
+        items.append(item)
+    return items
+
+
 @app.get("/families/{table_name}", response_model=List[ComponentFamilyOut])
 def list_family_components(
+    response: Response,
     table_name: str,
     q: Optional[str] = Query(None, description="Search across select fields"),
-    skip: int = 0,
-    limit: int = 100,
+    match: str = Query("fulltext", description=SEARCH_MODE_DESCRIPTION),
+    page: PageParams = Depends(),
+    fast: bool = Query(FAST_JSON_DEFAULT, description=FAST_JSON_DESCRIPTION),
     db: Session = Depends(get_db),
 ):
-    """List components from a specific family table."""
+    """
+    List components from a specific family table; full-text hits come ranked with a snippet.
+
+    Follow ``X-Next-Cursor`` for the next page; ``total`` adds ``X-Total-Count``.
+    """
     model = get_family_table_model(table_name)
     if not model:
         raise HTTPException(status_code=404, detail="Table not found")
     
-    query = db.query(model)
-    if q and hasattr(model, 'class_field'):
-        like = f"%{q}%"
-        query = query.filter(
-            (
-                (model.class_field.ilike(like))
-                | (model.family.ilike(like))
-                | (model.component.ilike(like))
-                | (model.component_name.ilike(like))
-                | (model.element.ilike(like))
-                | (model.element_item.ilike(like))
-            )
-        )
-    return query.offset(skip).limit(limit).all()
+    query, search_columns = _search(db.query(model), model, q, match)
+    fields = (ELEMENT_LIST_JSON_FIELDS if model is ElementListDb else FAMILY_JSON_FIELDS) if fast else None
+    return _list_page(response, query, model, q, search_columns, page, fields)
 
 
 @app.get("/element-lists", response_model=List[ElementListOut])
 def list_element_lists(
+    response: Response,
     q: Optional[str] = Query(None, description="Search across select fields"),
-    skip: int = 0,
-    limit: int = 100,
+    match: str = Query("fulltext", description=SEARCH_MODE_DESCRIPTION),
+    page: PageParams = Depends(),
+    fast: bool = Query(FAST_JSON_DEFAULT, description=FAST_JSON_DESCRIPTION),
     db: Session = Depends(get_db),
 ):
     """List elements from the element_list_db table."""
-    query = db.query(ElementListDb)
-    if q:
-        like = f"%{q}%"
-        query = query.filter(
-            (
-                (ElementListDb.element.ilike(like))
-                | (ElementListDb.element_index.ilike(like))
-                | (ElementListDb.item_list.ilike(like))
-            )
-        )
-    return query.offset(skip).limit(limit).all()
+    query, search_columns = _search(db.query(ElementListDb), ElementListDb, q, match)
+    fields = ELEMENT_LIST_JSON_FIELDS if fast else None
+    return _list_page(response, query, ElementListDb, q, search_columns, page, fields)
+
+
+@app.get("/search", response_model=SearchResponse)
+def search_catalog(
+    q: str = Query(..., min_length=1, description="Search string"),
+    kind: str = Query("all", description="functional, assurance or all"),
+    match: str = Query("fulltext", description=SEARCH_MODE_DESCRIPTION),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Search every family table and element_list_db in one query.
+
+    Hits are ranked across tables and tagged with the table they come from;
+    substring matches are unranked and ordered by table and id.
+    """
+    if kind not in SEARCH_KINDS:
+        raise HTTPException(status_code=400, detail=f"kind must be one of: {', '.join(SEARCH_KINDS)}")
+    if match not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"match must be one of: {', '.join(SEARCH_MODES)}")
+    # One extra row tells whether another page exists
+    items = catalog_search(db, q, kind, match, skip, limit + 1)
+    return {
+        "q": q, "kind": kind, "skip": skip, "limit": limit,
+        "has_more": len(items) > limit, "items": items[:limit],
+    }
+
+
+@app.get("/autocomplete", response_model=List[AutocompleteSuggestion])
+def autocomplete(
+    prefix: str = Query(..., min_length=1, description="Start of a component id, element id, id segment or name word"),
+    limit: int = Query(AUTOCOMPLETE_LIMIT, ge=1, le=AUTOCOMPLETE_MAX_LIMIT),
+):
+    """Typeahead suggestions from the in-memory identifier index; case-insensitive."""
+    autocomplete_index.refresh(SessionLocal)
+    return autocomplete_index.lookup(prefix, limit)
 
 
 @app.get("/element-lists/formatted/{element_id}")
-def get_formatted_element_list(element_id: str, db: Session = Depends(get_db)):
+def get_formatted_element_list(
+    element_id: str,
+    fast: bool = Query(FAST_JSON_DEFAULT, description=FAST_JSON_DESCRIPTION),
+    db: Session = Depends(get_db),
+):
     """Get formatted element list for a specific element ID (e.g., fau_gen.1.1)."""
     # Get all element list items for this element
     element_items = db.query(ElementListDb).filter(
@@ -1358,17 +1768,19 @@ def get_formatted_element_list(element_id: str, db: Session = Depends(get_db)):
     for item in element_items:
         formatted_items.append(item.item_list)
     
-    return {
+    result = {
         "element": element_id,
         "main_text": main_text,
         "items": formatted_items,
         "formatted_display": f"{element_id} {main_text}\n" + "\n".join(formatted_items)
     }
+    return FastJSONResponse(result) if fast else result
 
 
 @app.get("/families/{family_name}/formatted")
 def get_formatted_family_elements(
     family_name: str,
+    fast: bool = Query(FAST_JSON_DEFAULT, description=FAST_JSON_DESCRIPTION),
     db: Session = Depends(get_db)
 ):
     """Get formatted element lists for all elements in a family (e.g., fau_gen)."""
@@ -1408,7 +1820,7 @@ def get_formatted_family_elements(
             "formatted_display": f"{element_id} {main_text}\n" + "\n".join(items)
         })
     
-    return result
+    return FastJSONResponse(result) if fast else result
 
 
 @app.get("/families/{table_name}/count")
@@ -1439,7 +1851,9 @@ def create_family_component(table_name: str, payload: ComponentCreate, db: Sessi
         element_item=payload.element_item,
     )
     db.add(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     db.refresh(item)
     return item
 
@@ -1462,7 +1876,9 @@ def update_family_component(table_name: str, item_id: int, payload: ComponentUpd
     for k, v in data.items():
         setattr(item, k, v)
     db.add(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     db.refresh(item)
     return item
 
@@ -1479,7 +1895,9 @@ def delete_family_component(table_name: str, item_id: int, db: Session = Depends
         raise HTTPException(status_code=404, detail="Not found")
 
     db.delete(item)
+    bump_catalog_revision(db)
     db.commit()
+    _catalog_changed()
     return None
 
 
@@ -1531,7 +1949,7 @@ async def generate_cover_preview(payload: CoverPreviewRequest):
     # Ensure the upload directory exists to maintain parity with the image uploads
     get_user_upload_dir(payload.user_id, create=True)
 
-    output_path = _build_cover_document(payload)
+    output_path = await cpu_executor.run(_build_cover_document, payload)
     return {"path": f"/cover/docx/{payload.user_id}/{output_path.name}"}
 
 
@@ -1540,7 +1958,11 @@ async def generate_sfr_preview(payload: HtmlPreviewRequest):
     if not payload.user_id:
         raise HTTPException(status_code=400, detail="User identifier is required")
 
-    output_path = _build_html_preview_document(payload.html_content, payload.user_id, SFR_DOCX_ROOT)
+    # Validated up front: HTTPException cannot be returned from a worker process
+    _get_preview_docx_dir(SFR_DOCX_ROOT, payload.user_id)
+    output_path = await cpu_executor.run(
+        _build_html_preview_document, payload.html_content, payload.user_id, SFR_DOCX_ROOT
+    )
     return {"path": f"/security/sfr/docx/{payload.user_id}/{output_path.name}"}
 
 
@@ -1549,7 +1971,11 @@ async def generate_sar_preview(payload: HtmlPreviewRequest):
     if not payload.user_id:
         raise HTTPException(status_code=400, detail="User identifier is required")
 
-    output_path = _build_html_preview_document(payload.html_content, payload.user_id, SAR_DOCX_ROOT)
+    # Validated up front: HTTPException cannot be returned from a worker process
+    _get_preview_docx_dir(SAR_DOCX_ROOT, payload.user_id)
+    output_path = await cpu_executor.run(
+        _build_html_preview_document, payload.html_content, payload.user_id, SAR_DOCX_ROOT
+    )
     return {"path": f"/security/sar/docx/{payload.user_id}/{output_path.name}"}
 
 
@@ -1558,7 +1984,11 @@ async def generate_spd_preview(payload: HtmlPreviewRequest):
     if not payload.user_id:
         raise HTTPException(status_code=400, detail="User identifier is required")
 
-    output_path = _build_html_preview_document(payload.html_content, payload.user_id, SPD_DOCX_ROOT)
+    # Validated up front: HTTPException cannot be returned from a worker process
+    _get_preview_docx_dir(SPD_DOCX_ROOT, payload.user_id)
+    output_path = await cpu_executor.run(
+        _build_html_preview_document, payload.html_content, payload.user_id, SPD_DOCX_ROOT
+    )
     return {"path": f"/spd/docx/{payload.user_id}/{output_path.name}"}
 
 
@@ -1567,7 +1997,9 @@ async def generate_st_intro_preview(payload: STIntroPreviewRequest):
     if not payload.user_id:
         raise HTTPException(status_code=400, detail="User identifier is required")
 
-    output_path = _build_st_intro_combined_document(payload)
+    # Validated up front: HTTPException cannot be returned from a worker process
+    _get_preview_docx_dir(ST_INTRO_DOCX_ROOT, payload.user_id)
+    output_path = await cpu_executor.run(_build_st_intro_combined_document, payload)
     return {"path": f"/st-intro/docx/{payload.user_id}/{output_path.name}"}
 
 
@@ -1631,7 +2063,9 @@ async def generate_final_preview(payload: FinalPreviewRequest):
     if not payload.user_id:
         raise HTTPException(status_code=400, detail="User identifier is required")
 
-    output_path = _build_final_combined_document(payload)
+    # Validated up front: HTTPException cannot be returned from a worker process
+    _get_preview_docx_dir(FINAL_DOCX_ROOT, payload.user_id)
+    output_path = await cpu_executor.run(_build_final_combined_document, payload)
     return {"path": f"/final-preview/docx/{payload.user_id}/{output_path.name}"}
 
 
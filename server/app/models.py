@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
 from .database import Base
 
 
@@ -12,6 +12,8 @@ class Component(Base):
     component_name = Column(Text, nullable=True)  # Changed to Text to handle longer content
     element = Column(String(200), nullable=True)
     element_item = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Set by XML imports for incremental re-import
+    source_file = Column(String(255), nullable=True)  # Catalog file the row was imported from
 
 
 # Base class for component family tables
@@ -24,6 +26,8 @@ class ComponentFamilyBase:
     component_name = Column(Text, nullable=True)
     element = Column(String(255), nullable=True, index=True)
     element_item = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # Set by XML imports for incremental re-import
+    source_file = Column(String(255), nullable=True)  # Catalog file the row was imported from
 
 
 # Functional Requirements Tables (f-class tables)
@@ -133,3 +137,30 @@ class ElementListDb(Base):
     element_index = Column(String(255), nullable=True, index=True, unique=True)
     item_list = Column(Text, nullable=True)
     color = Column(String(50), nullable=True)  # For handling colored elements
+    content_hash = Column(String(64), nullable=True)  # Set by XML imports for incremental re-import
+    source_file = Column(String(255), nullable=True)  # Catalog file the row was imported from
+
+
+class ImportHistory(Base):
+    """One catalog import run, kept to follow import performance across catalog versions."""
+    __tablename__ = "import_history"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    started_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    source = Column(String(255), nullable=True)  # Uploaded or imported file name
+    catalog_version = Column(String(100), nullable=True)  # "version" attribute of the <cc> root
+    mode = Column(String(50), nullable=True)  # e.g. "default", "stream+incremental"
+    success = Column(Boolean, nullable=False, default=False)
+    components_imported = Column(Integer, nullable=False, default=0)
+    element_lists_imported = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=True)
+    timings = Column(Text, nullable=True)  # JSON encoded XmlImportTimings
+    error = Column(Text, nullable=True)
+
+
+class CatalogRevision(Base):
+    """Single-row counter bumped by every catalog write, so caches in any process can tell the catalog changed."""
+    __tablename__ = "catalog_revision"
+
+    id = Column(Integer, primary_key=True)
+    revision = Column(Integer, nullable=False, default=0)
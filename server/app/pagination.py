@@ -0,0 +1,146 @@
+"""
+Keyset pagination for the list endpoints.
+Pages are ordered by a sort key that always ends with ``id``, and the next page
+starts after the last row of the previous one (``WHERE key > :last``) instead of
+skipping rows. The position travels as an opaque cursor in the ``X-Next-Cursor``
+response header, so deep pages cost the same as the first one and rows inserted
+or deleted between requests do not shift later pages. ``skip`` keeps working for
+clients that page by offset.
+"""
+import base64
+import json
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Query
+from sqlalchemy import Column, Table, and_, false, func, or_, select, text
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+PAGINATION_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_ESTIMATED_HEADER]
+
+TOTAL_MODES = ("none", "exact", "estimate")
+# JSON scalars a cursor may carry; anything else never came from encode_cursor
+CURSOR_VALUE_TYPES = (str, int, float)
+# Columns ordered after the sort column (before id) so related rows stay together
+SORT_TIEBREAKERS = {"component": ("element",)}
+
+SORT_DESCRIPTION = (
+    "Indexed column to order by, prefixed with - for descending (e.g. component, -id); ties are broken by id. "
+    "Defaults to relevance for full-text searches and to id otherwise"
+)
+CURSOR_DESCRIPTION = "X-Next-Cursor of the previous page; takes the place of skip"
+TOTAL_DESCRIPTION = (
+    "exact: count the matching rows into X-Total-Count; "
+    "estimate: use the planner's row estimate when nothing is filtered (PostgreSQL), else count"
+)
+
+
+class PageParams:
+    """Query parameters shared by the paginated list endpoints."""
+
+    def __init__(
+        self,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(100, ge=0),
+        cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+        sort: Optional[str] = Query(None, description=SORT_DESCRIPTION),
+        total: str = Query("none", description=TOTAL_DESCRIPTION),
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.sort = sort
+        self.total = total
+
+
+class SortKey(NamedTuple):
+    column: Column
+    descending: bool
+
+
+def sortable_columns(table: Table) -> List[str]:
+    """Columns with an index (primary key, unique or secondary), which can be paged through cheaply."""
+    return [column.name for column in table.columns if column.primary_key or column.index or column.unique]
+
+
+def sort_keys(table: Table, sort: str) -> List[SortKey]:
+    """Resolve a sort parameter like ``-component`` to its keys, ending with the id tie-breaker."""
+    descending = sort.startswith("-")
+    name = sort.lstrip("-+")
+    allowed = sortable_columns(table)
+    if name not in allowed:
+        raise ValueError(f"sort must be one of: {', '.join(allowed)} (optionally prefixed with -)")
+    names = [name, *SORT_TIEBREAKERS.get(name, ()), "id"]
+    return [SortKey(table.c[key], descending) for key in dict.fromkeys(names) if key in table.c]
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    payload = json.dumps({"sort": sort, "after": list(values)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, List[Any]]:
+    """The sort and the key values of the last row seen; raises ValueError for malformed cursors."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        sort, values = payload["sort"], payload["after"]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(sort, str) or not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    for value in values:
+        if value is not None and (isinstance(value, bool) or not isinstance(value, CURSOR_VALUE_TYPES)):
+            raise ValueError("Invalid cursor")
+    return sort, values
+
+
+def _after(key: SortKey, value: Any, nulls_high: bool):
+    """Rows strictly after ``value`` in the key's direction, placing NULLs where the database sorts them."""
+    column = key.column
+    # NULLs come last when ascending with NULLs high or descending with NULLs low
+    if key.descending != nulls_high:
+        if value is None:
+            return false()
+        return or_(column < value if key.descending else column > value, column.is_(None))
+    if value is None:
+        return column.is_not(None)
+    return column < value if key.descending else column > value
+
+
+def keyset_filter(keys: Sequence[SortKey], values: Sequence[Any], dialect_name: str):
+    """``(k1, k2, ..., id) > (v1, v2, ..., vid)`` in sort order, spelled out so each key can have NULLs."""
+    if len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    for key, value in zip(keys, values):
+        # Each value must fit its column, or the comparison fails in the database
+        if value is None and not key.column.nullable:
+            raise ValueError("Invalid cursor")
+        if value is not None and not isinstance(value, key.column.type.python_type):
+            raise ValueError("Invalid cursor")
+    # The native NULL placement is kept so ORDER BY can still walk the index
+    nulls_high = dialect_name == "postgresql"
+    clauses = []
+    equal = []
+    for key, value in zip(keys, values):
+        clauses.append(and_(*equal, _after(key, value, nulls_high)))
+        equal.append(key.column.is_(None) if value is None else key.column == value)
+    return or_(*clauses)
+
+
+def apply_sort(query, keys: Sequence[SortKey]):
+    return query.order_by(None).order_by(*(key.column.desc() if key.descending else key.column for key in keys))
+
+
+def count_rows(query, table: Table, filtered: bool, mode: str) -> Tuple[int, bool]:
+    """Total rows of ``query`` and whether it is an estimate."""
+    db = query.session
+    if mode == "estimate" and not filtered and db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"), {"table": table.name}
+        ).scalar()
+        # -1 until the table has been vacuumed or analyzed
+        if estimate is not None and estimate >= 0:
+            return int(estimate), True
+    return db.execute(select(func.count()).select_from(query.order_by(None).subquery())).scalar_one(), False
@@ -0,0 +1,143 @@
+"""
+On-disk cache for /xml/parse responses.
+Entries are keyed by the SHA-256 of the uploaded bytes and stored as gzip-compressed
+JSON. The directory is kept under a byte budget by evicting least recently used entries.
+"""
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+
+# Bump whenever the parse output changes shape so stale entries are never served
+PARSE_CACHE_VERSION = "1"
+ENTRY_SUFFIX = ".json.gz"
+
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "ccgentool2_parse_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DIGEST_CHUNK_BYTES = 1024 * 1024
+DEFAULT_COMPRESSLEVEL = 6
+
+
+def xml_digest(content: Union[bytes, BinaryIO]) -> str:
+    """Cache key for an uploaded document, given as bytes or a seekable binary file."""
+    digest = hashlib.sha256()
+    digest.update(f"parse-v{PARSE_CACHE_VERSION}\0".encode("ascii"))
+    if isinstance(content, (bytes, bytearray)):
+        digest.update(content)
+    else:
+        # Hash the spooled upload in chunks and rewind it for the parser
+        content.seek(0)
+        for chunk in iter(lambda: content.read(DIGEST_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def compress_payload(body: bytes, compresslevel: int = DEFAULT_COMPRESSLEVEL) -> bytes:
+    """Gzip a JSON body the way cache entries are stored; safe to run in a worker process."""
+    return gzip.compress(body, compresslevel=compresslevel, mtime=0)
+
+
+class ParseResultCache:
+    """Size-bounded LRU of serialized parse responses, one gzip file per digest."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES, compresslevel: int = DEFAULT_COMPRESSLEVEL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.compresslevel = compresslevel
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Return the compressed payload stored for ``digest``, or None."""
+        if not self.enabled:
+            return None
+        path = self._path(digest)
+        try:
+            payload = path.read_bytes()
+            # The access time drives eviction, and atime is often disabled on mounts
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return payload
+
+    def store(self, digest: str, payload: bytes) -> bytes:
+        """Store a payload from :func:`compress_payload` and evict old entries; returns the payload."""
+        if not self.enabled or len(payload) > self.max_bytes:
+            return payload
+
+        path = self._path(digest)
+        handle, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(payload)
+            # Atomic rename so concurrent readers never see a partial entry
+            os.replace(temp_name, path)
+        except OSError:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
+        self._evict()
+        return payload
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Union[int, str, bool]]:
+        entries = list(self._entries())
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "directory": str(self.directory),
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _path(self, digest: str) -> Path:
+        if len(digest) != 64 or any(char not in "0123456789abcdef" for char in digest):
+            raise ValueError("Invalid cache digest")
+        return self.directory / f"{digest}{ENTRY_SUFFIX}"
+
+    def _entries(self):
+        for path in self.directory.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+
+parse_cache = ParseResultCache(
+    os.getenv("XML_PARSE_CACHE_DIR", DEFAULT_CACHE_DIR),
+    max_bytes=int(os.getenv("XML_PARSE_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))),
+)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 
@@ -34,6 +35,10 @@ class ComponentUpdate(BaseModel):
 
 class ComponentOut(ComponentBase):
     id: int
+    source_file: Optional[str] = None
+    # Full-text search hits: highlighted excerpt (<mark>...</mark>) and relevance
+    snippet: Optional[str] = None
+    rank: Optional[float] = None
 
 
 # Schema for family-specific component tables
@@ -69,6 +74,10 @@ class ComponentFamilyUpdate(BaseModel):
 
 class ComponentFamilyOut(ComponentFamilyBase):
     id: int
+    source_file: Optional[str] = None  # Catalog file the row was imported from
+    # Full-text search hits: highlighted excerpt (<mark>...</mark>) and relevance
+    snippet: Optional[str] = None
+    rank: Optional[float] = None
 
 
 # Schema for element list table
@@ -98,6 +107,57 @@ class ElementListUpdate(BaseModel):
 
 class ElementListOut(ElementListBase):
     id: int
+    source_file: Optional[str] = None
+    snippet: Optional[str] = None
+    rank: Optional[float] = None
+
+
+class SearchHit(BaseModel):
+    table: str  # Source table, e.g. fau_db or element_list_db
+    kind: str  # functional or assurance
+    id: int
+    element: Optional[str] = None
+    element_index: Optional[str] = None  # element_list_db hits only
+    component: Optional[str] = None
+    component_name: Optional[str] = None
+    text: Optional[str] = None  # element_item, or item_list for element lists
+    snippet: Optional[str] = None
+    rank: float = 0.0
+
+
+class SearchResponse(BaseModel):
+    q: str
+    kind: str
+    skip: int
+    limit: int
+    has_more: bool
+    items: List[SearchHit]
+
+
+class AutocompleteSuggestion(BaseModel):
+    value: str
+    type: str  # component, element or component_name
+    table: str
+    kind: str  # functional or assurance
+    component: Optional[str] = None
+    component_name: Optional[str] = None
+
+
+class FamilyTableStats(BaseModel):
+    table: str
+    kind: str  # functional, assurance, special or general
+    rows: int
+    components: Optional[int] = None  # Distinct component ids; None for element_list_db
+    families: Optional[int] = None
+    last_import_at: Optional[datetime] = None
+
+
+class CatalogStatsResponse(BaseModel):
+    tables: List[FamilyTableStats]
+    total_rows: int
+    last_import_at: Optional[datetime] = None
+    generated_at: datetime
+    cached: bool  # Served from the cache kept until the next write or import
 
 
 # XML Parser Schemas
@@ -108,6 +168,53 @@ class XmlParseResponse(BaseModel):
     components: Optional[List[Dict[str, str]]] = None
 
 
+class XmlTreeNodeOut(BaseModel):
+    path: str  # Slash separated child indexes from the root; "" is the root itself
+    label: str
+    data: Optional[str] = None
+    attributes: Dict[str, str] = {}
+    child_count: int
+
+
+class XmlTreeResponse(BaseModel):
+    success: bool
+    handle: str
+    expires_in_seconds: int
+    root: XmlTreeNodeOut
+    components: Optional[List[Dict[str, str]]] = None
+
+
+class XmlTreeChildrenResponse(BaseModel):
+    handle: str
+    node: XmlTreeNodeOut
+    offset: int
+    limit: int
+    total: int
+    children: List[XmlTreeNodeOut]
+
+
+class XmlImportTimings(BaseModel):
+    # Seconds per phase; streaming imports count parsing under extract
+    parse: float = 0.0
+    extract: float = 0.0
+    build_rows: float = 0.0
+    write_components: float = 0.0
+    write_element_lists: float = 0.0
+    commit: float = 0.0
+    swap: float = 0.0  # Staged imports: replacing the live tables with the staging tables
+    total: float = 0.0
+    rows: Dict[str, int] = {}  # Rows queued per table
+
+
+class XmlImportConflict(BaseModel):
+    """An element id defined by more than one file of a multi-file import."""
+    table: str
+    element: str
+    kept: str  # File whose definition was imported
+    skipped: str
+    identical: bool
+
+
 class XmlImportResponse(BaseModel):
     success: bool
     message: str
@@ -116,3 +223,37 @@ class XmlImportResponse(BaseModel):
     element_lists_imported: Optional[int] = 0
     errors: Optional[List[str]] = None
     tables_used: Optional[List[str]] = None  # Track which tables were used
+    table_stats: Optional[Dict[str, Dict[str, Any]]] = None  # Rows written and rows/second per table
+    sync_stats: Optional[Dict[str, Dict[str, int]]] = None  # Incremental imports: inserted/updated/deleted/unchanged/skipped
+    timings: Optional[XmlImportTimings] = None
+    conflicts: Optional[List[XmlImportConflict]] = None
+
+
+class XmlImportJobOut(BaseModel):
+    id: str
+    filename: str
+    status: str  # queued, running, completed, failed
+    phase: str  # queued, parsing, extracting, writing, committing, swapping, completed, failed
+    options: Dict[str, bool]
+    rows_processed: Dict[str, int]
+    total_rows_processed: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    elapsed_seconds: float
+    result: Optional[XmlImportResponse] = None
+    error: Optional[str] = None
+
+
+class ImportHistoryOut(BaseModel):
+    id: int
+    started_at: datetime
+    source: Optional[str] = None
+    catalog_version: Optional[str] = None
+    mode: Optional[str] = None
+    success: bool
+    components_imported: int
+    element_lists_imported: int
+    total_seconds: Optional[float] = None
+    timings: Optional[XmlImportTimings] = None
+    error: Optional[str] = None
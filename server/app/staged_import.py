@@ -0,0 +1,117 @@
+"""
+Staged full catalog imports.
+A full import is written into empty staging copies of the catalog tables and
+committed there first. Only then are the live tables replaced, in one short
+transaction that deletes the old rows and copies the staged ones across with
+INSERT ... SELECT. Readers keep seeing the previous catalog until that commit,
+and an import that fails before it leaves the live tables untouched.
+Every import stages into tables of its own, so concurrent staged imports (an
+upload, a background job and the CLI) never touch each other's rows.
+"""
+import re
+import secrets
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Column, MetaData, Table, delete, inspect, insert, select, text
+from sqlalchemy.orm import Session
+
+from .bulk_writer import BulkRowWriter
+
+
+STAGING_PREFIX = "staging_"
+# Staging tables of imports killed before they could drop them are removed after this long
+STALE_STAGING_SECONDS = 24 * 3600
+# staging_<creation time as 8 hex digits><6 random hex digits>_<live table>
+STAGING_NAME_RE = re.compile(rf"^{STAGING_PREFIX}([0-9a-f]{{8}})[0-9a-f]{{6}}_")
+
+
+def new_staging_id() -> str:
+    """Unique id of one staged import; starts with its creation time so leftovers can be aged."""
+    return f"{int(time.time()):08x}{secrets.token_hex(3)}"
+
+
+def drop_stale_staging_tables(connection, max_age_seconds: float = STALE_STAGING_SECONDS) -> None:
+    """Drop staging tables left behind by imports that were killed; running imports are never that old."""
+    cutoff = time.time() - max_age_seconds
+    preparer = connection.dialect.identifier_preparer
+    for name in inspect(connection).get_table_names():
+        match = STAGING_NAME_RE.match(name)
+        if match and int(match.group(1), 16) < cutoff:
+            connection.execute(text(f"DROP TABLE IF EXISTS {preparer.quote(name)}"))
+
+
+def staging_table(table: Table, metadata: MetaData, staging_id: str) -> Table:
+    """Copy of ``table`` without secondary indexes; unique columns stay unique for upserts."""
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.primary_key,
+            autoincrement=column.autoincrement,
+            nullable=column.nullable,
+            unique=bool(column.unique),
+        )
+        for column in table.columns
+        # Generated columns are recomputed by the live table
+        if column.computed is None
+    ]
+    return Table(f"{STAGING_PREFIX}{staging_id}_{table.name}", metadata, *columns)
+
+
+class StagedCatalogWriter:
+    """
+    Writes the rows of a full import into staging tables.
+
+    Exposes the same ``add``/``upsert``/``flush``/``table_stats`` interface as
+    :class:`BulkRowWriter`; rows for tables that are not staged are written
+    directly. :meth:`publish` then swaps the staged rows into the live tables.
+    """
+
+    def __init__(self, db: Session, tables: Sequence[Table], batch_size: Optional[int] = None):
+        self.db = db
+        self.writer = BulkRowWriter(db, batch_size=batch_size)
+        metadata = MetaData()
+        self.staging_id = new_staging_id()
+        self._live: Dict[str, Table] = {table.name: table for table in tables}
+        self._staging: Dict[str, Table] = {
+            table.name: staging_table(table, metadata, self.staging_id) for table in tables
+        }
+        connection = db.connection()
+        drop_stale_staging_tables(connection)
+        for staging in self._staging.values():
+            staging.create(bind=connection)
+
+    def add(self, table: Table, row: Dict[str, Any]) -> None:
+        self.writer.add(self._staging.get(table.name, table), row)
+
+    def upsert(self, table: Table, row: Dict[str, Any], key: str, update_columns: Sequence[str]) -> None:
+        self.writer.upsert(self._staging.get(table.name, table), row, key, update_columns)
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def table_stats(self) -> Dict[str, Dict[str, float]]:
+        """Write statistics keyed by the live table names."""
+        live_names = {staging.name: name for name, staging in self._staging.items()}
+        return {live_names.get(name, name): stats for name, stats in self.writer.table_stats().items()}
+
+    def publish(self) -> None:
+        """Replace the live rows with the staged ones and drop the staging tables; the caller commits."""
+        for name, staging in self._staging.items():
+            live = self._live[name]
+            # The live table assigns its own ids so its sequence stays consistent
+            columns = [column.name for column in staging.columns if not column.primary_key]
+            self.db.execute(delete(live))
+            self.db.execute(
+                insert(live).from_select(
+                    columns, select(*(staging.c[column] for column in columns)).order_by(staging.c.id)
+                )
+            )
+        self.discard()
+
+    def discard(self) -> None:
+        """Drop the staging tables."""
+        connection = self.db.connection()
+        for staging in self._staging.values():
+            staging.drop(bind=connection, checkfirst=True)
@@ -0,0 +1,143 @@
+"""
+Table-driven assembly of requirement text from CC XML elements.
+An assembler walks an element once, collecting raw text fragments (element text,
+tag-specific fragments such as ``[assignment: ...]``, and tails) into a list.
+Whitespace is normalized a single time when the fragments are joined.
+"""
+import re
+from typing import Callable, Dict, List, Optional
+
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+# handler(assembler, child, parts) appends the child's fragments; its tail is added by the assembler
+Rule = Callable[['TextAssembler', object, List[str]], None]
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip the text and collapse every whitespace run into a single space."""
+    return WHITESPACE_RE.sub(' ', text.strip())
+
+
+class TextAssembler:
+    """Collects the text of an element in document order using per-tag rules."""
+
+    def __init__(self, rules: Dict[str, Rule], default: Optional[Rule] = None):
+        self.rules = rules
+        # Applied to children without a rule; None keeps only their tail
+        self.default = default
+
+    def __call__(self, element) -> str:
+        parts: List[str] = []
+        self.collect(element, parts)
+        return normalize_whitespace(' '.join(parts))
+
+    def collect(self, element, parts: List[str]) -> None:
+        if element.text:
+            parts.append(element.text)
+        rules = self.rules
+        default = self.default
+        for child in element:
+            # Comments and processing instructions have no string tag and no requirement text
+            if isinstance(child.tag, str):
+                handler = rules.get(child.tag, default)
+                if handler is not None:
+                    handler(self, child, parts)
+            if child.tail:
+                parts.append(child.tail)
+
+
+def selection_text(element) -> str:
+    """Comma separated items of an fe-selection, including nested fe-selectionnotes."""
+    items = []
+    for child in element:
+        if child.tag == 'fe-selectionitem':
+            if child.text:
+                items.append(child.text.strip())
+        elif child.tag == 'fe-selectionnotes':
+            items.append(selection_text(child))
+    return ', '.join(filter(None, items))
+
+
+def _assignment_rule(item_tag: str) -> Rule:
+    def rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+        item = child.find(item_tag)
+        if item is not None and item.text:
+            parts.append(f'[assignment: {item.text.strip()}]')
+    return rule
+
+
+def _selection_items(child) -> List[str]:
+    return [item.text.strip() for item in child.findall('fe-selectionitem') if item.text and item.text.strip()]
+
+
+def _selection_rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+    items = _selection_items(child)
+    if items:
+        parts.append(f"[selection: {', '.join(items)}]")
+
+
+def _selection_with_assignments_rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+    # The display tree keeps assignments nested in a selection, and leaves an empty one open
+    items = _selection_items(child)
+    if not items:
+        parts.append('[selection:')
+        return
+    assignments = [f'[assignment: {item.text.strip()}]' for item in child.findall('.//fe-assignmentitem') if item.text]
+    parts.append(f"[selection: {', '.join(items + assignments)}]")
+
+
+def _selection_notes_rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+    parts.append(f'[selection: {selection_text(child)}]')
+
+
+def _is_assurance_detail_element(tag: str) -> bool:
+    """Evaluator work units and similar detail blocks that assurance text leaves out."""
+    return tag.startswith('m-') or tag == 'ae-dc-element'
+
+
+def _assurance_child_rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+    if not _is_assurance_detail_element(child.tag):
+        assembler.collect(child, parts)
+
+
+def _element_child_rule(assembler: TextAssembler, child, parts: List[str]) -> None:
+    # Assurance evidence elements (ae-*) only contribute their direct requirement text
+    if child.tag.startswith('ae-'):
+        mark = len(parts)
+        ASSURANCE_TEXT.collect(child, parts)
+        if any(part.strip() for part in parts[mark:]):
+            return
+        del parts[mark:]
+    assembler.collect(child, parts)
+
+
+# f-element text shown in the display tree
+FE_ELEMENT_TEXT = TextAssembler({
+    'assignment': _assignment_rule('assignmentitem'),
+    'fe-assignment': _assignment_rule('fe-assignmentitem'),
+    'fe-selection': _selection_with_assignments_rule,
+})
+
+# One fe-item of an fe-list
+FE_ITEM_TEXT = TextAssembler({
+    'fe-selection': _selection_notes_rule,
+    'fe-assignment': _assignment_rule('fe-assignmentitem'),
+})
+
+# Primary requirement text of assurance evidence elements
+ASSURANCE_TEXT = TextAssembler({}, default=_assurance_child_rule)
+
+# Component element_item text: every nested element is included
+ELEMENT_TEXT = TextAssembler({
+    'assignment': _assignment_rule('assignmentitem'),
+    'fe-assignment': _assignment_rule('fe-assignmentitem'),
+    'fe-selection': _selection_rule,
+}, default=_element_child_rule)
+
+
+def element_text(element) -> str:
+    """Complete text of an f-element, a-element or ae-* element, including assignments."""
+    parts: List[str] = []
+    _element_child_rule(ELEMENT_TEXT, element, parts)
+    return normalize_whitespace(' '.join(parts))
@@ -0,0 +1,103 @@
+"""
+In-memory cache of parsed XML display trees for lazy browsing.
+A parsed document is kept under a handle so clients can page through the children
+of one node at a time. The cache holds a bounded number of documents and drops
+entries that have not been accessed within the TTL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .xml_parser_service import XmlNode
+
+
+DEFAULT_TTL_SECONDS = int(os.getenv("XML_TREE_CACHE_TTL", "900"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("XML_TREE_CACHE_SIZE", "8"))
+
+
+class ParsedTree:
+    """A parsed document: the display tree plus the flat component list."""
+
+    def __init__(self, root: XmlNode, components: List[Dict[str, str]]):
+        self.root = root
+        self.components = components
+        self.expires_at = 0.0
+
+    def resolve(self, path: str) -> Optional[XmlNode]:
+        """Find a node from its slash separated child indexes, e.g. ``"3/0/12"``; ``""`` is the root."""
+        node = self.root
+        for part in filter(None, path.split("/")):
+            if not part.isdigit():
+                return None
+            index = int(part)
+            if index >= len(node.children):
+                return None
+            node = node.children[index]
+        return node
+
+
+def node_summary(node: XmlNode, path: str) -> Dict[str, Any]:
+    """A single node without its descendants."""
+    return {
+        "path": path,
+        "label": node.label,
+        "data": node.data,
+        "attributes": node.attributes,
+        "child_count": len(node.children),
+    }
+
+
+def children_page(node: XmlNode, path: str, offset: int, limit: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Summaries of ``node``'s direct children in ``[offset, offset + limit)`` and the total count."""
+    prefix = f"{path}/" if path else ""
+    page = node.children[offset:offset + limit]
+    return (
+        [node_summary(child, f"{prefix}{offset + index}") for index, child in enumerate(page)],
+        len(node.children),
+    )
+
+
+class TreeCache:
+    """LRU of parsed trees with sliding TTL expiry."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, ParsedTree]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, handle: str) -> Optional[ParsedTree]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            tree = self._entries.get(handle)
+            if tree is None:
+                return None
+            tree.expires_at = now + self.ttl_seconds
+            self._entries.move_to_end(handle)
+            return tree
+
+    def put(self, handle: str, tree: ParsedTree) -> ParsedTree:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            tree.expires_at = now + self.ttl_seconds
+            self._entries[handle] = tree
+            self._entries.move_to_end(handle)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return tree
+
+    def discard(self, handle: str) -> bool:
+        with self._lock:
+            return self._entries.pop(handle, None) is not None
+
+    def _expire(self, now: float) -> None:
+        expired = [handle for handle, tree in self._entries.items() if tree.expires_at <= now]
+        for handle in expired:
+            del self._entries[handle]
+
+
+tree_cache = TreeCache()
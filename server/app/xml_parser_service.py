@@ -3,46 +3,211 @@ XML Parser Service for Common Criteria XML files.
 Adapted from the original Qt-based xml_parser_model.py to work with web backend.
 Now includes multi-table database insertion based on component families.
 """
-from typing import Dict, List, Any, Optional, Type
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from itertools import chain, repeat
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Sequence, Tuple, Type, Union
 from lxml import etree
-import re
 from sqlalchemy.orm import Session
+from .bulk_writer import BulkRowWriter
+from .catalog_sync import IncrementalCatalogSync, compute_content_hash
+from .catalog_version import bump_catalog_revision
 from .models import (
-    Component, ComponentFamilyBase, ElementListDb,
+    Component, ComponentFamilyBase, ElementListDb, ImportHistory,
     FauDb, FcoDb, FcsDb, FdpDb, FiaDb, FmtDb, FprDb, FptDb, FruDb, FtaDb, FtpDb,
     AcoDb, AdvDb, AgdDb, AlcDb, ApeDb, AseDb, AteDb, AvaDb
 )
+from .import_timing import PhaseTimer
+from .staged_import import StagedCatalogWriter
+from .text_assembly import FE_ELEMENT_TEXT, FE_ITEM_TEXT, WHITESPACE_RE, element_text, normalize_whitespace
+
+
+# Catalog hierarchy: class -> family -> component -> requirement element
+CLASS_TAGS = ('f-class', 'a-class')
+FAMILY_TAGS = ('f-family', 'a-family')
+COMPONENT_TAGS = ('f-component', 'a-component')
+ELEMENT_TAGS = frozenset(('f-element', 'a-element', 'ae-developer', 'ae-content', 'ae-evaluator'))
+# Top-level elements shown in the display tree
+TREE_ROOT_TAGS = ('f-class', 'a-class', 'eal', 'cap')
+
+
+
+class ComponentRecord(NamedTuple):
+    """One requirement element extracted from the catalog."""
+    class_name: str
+    class_id: str
+    family: str
+    component: str
+    component_name: str
+    element: str
+    element_item: str
+
+
+RecordBatch = Tuple[List[ComponentRecord], List[Dict[str, Any]]]
+# A record batch with the name of the catalog file it came from (None when unknown)
+SourcedBatch = Tuple[Optional[str], RecordBatch]
+# Called with the current import phase and the rows queued so far per table
+ProgressCallback = Callable[[str, Dict[str, int]], None]
+# XML text, raw bytes, a filesystem path or a binary file object
+XmlSource = Union[str, bytes, Path, BinaryIO]
+
+class ElementOwnership:
+    """
+    Remembers which catalog file first defined each element id during one import.
+
+    Later definitions of the same id in another file are skipped and reported as
+    conflicts, so combining a base catalog with protection profiles and extended
+    component files never duplicates a requirement.
+
+    Only the owning file and a short digest of the content are kept per id, and
+    nothing at all for single-source imports, so memory stays flat for those.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._owners: Dict[Tuple[str, str], Tuple[str, bytes]] = {}
+        self.conflicts: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def _digest(content: Any) -> bytes:
+        return hashlib.blake2b(repr(content).encode('utf-8'), digest_size=8).digest()
+
+    def claim(self, table_name: str, element_id: Optional[str], source_file: Optional[str], content: Any) -> bool:
+        """True when the row should be written; False when another file already owns the id."""
+        if not self.enabled or not element_id or source_file is None:
+            return True
+        key = (table_name, element_id)
+        owner = self._owners.get(key)
+        if owner is None:
+            self._owners[key] = (source_file, self._digest(content))
+            return True
+        owner_file, owner_digest = owner
+        if owner_file == source_file:
+            return True
+        self.conflicts.append({
+            'table': table_name,
+            'element': element_id,
+            'kept': owner_file,
+            'skipped': source_file,
+            # Identical redefinitions are harmless; differing ones need a decision
+            'identical': owner_digest == self._digest(content),
+        })
+        return False
+
+
+# Worker processes for parallel per-class extraction (0 means one per CPU)
+PARALLEL_WORKERS = int(os.getenv("XML_PARALLEL_WORKERS", "0"))
+
+# Lift libxml2's depth and text node size limits for very large catalogs
+XML_HUGE_TREE = os.getenv("XML_HUGE_TREE", "false").lower() in ("1", "true", "yes")
+# Uploads are untrusted: never fetch external resources or expand entities
+XML_PARSER_OPTIONS: Dict[str, Any] = dict(no_network=True, resolve_entities=False, huge_tree=XML_HUGE_TREE)
+
+_parser_local = threading.local()
+
+
+def get_xml_parser() -> etree.XMLParser:
+    """Hardened XMLParser reused by every parse on the calling thread (parsers are not thread-safe)."""
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(**XML_PARSER_OPTIONS)
+    return parser
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Process pool shared by every parallel extraction, created on first use."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS or None)
+        return _extraction_pool
+
+
+def _extract_class_subtree(class_xml: bytes, build_tree: bool) -> Tuple[List[RecordBatch], Optional[Dict[str, Any]]]:
+    """Worker entry point: walk one serialized f-class/a-class subtree."""
+    class_elem = etree.fromstring(class_xml, get_xml_parser())
+    service = XmlParserService()
+    class_node = service._create_hierarchy_node(XmlNode("Root"), class_elem) if build_tree else None
+    batches = list(service._walk_class(class_elem, class_node))
+    return batches, class_node.to_dict() if class_node is not None else None
+
+
+# Shared by every node without attributes; nodes get their own dict when they have some
+_NO_ATTRIBUTES: Dict[str, str] = {}
 
 
 class XmlNode:
     """Represents a node in the XML tree structure."""
+
+    # The tree holds one node per element, attribute and text fragment, so keep nodes small
+    __slots__ = ('label', 'data', 'children', 'attributes')
     
     def __init__(self, label: str, data: Optional[str] = None):
         self.label = label
         self.data = data
-        self.children: List['XmlNode'] = []
-        self.attributes: Dict[str, str] = {}
+        # Leaves (most nodes) share the empty tuple until their first child arrives
+        self.children: Sequence['XmlNode'] = ()
+        self.attributes: Dict[str, str] = _NO_ATTRIBUTES
     
     def add_child(self, child: 'XmlNode') -> None:
         """Add a child node."""
-        self.children.append(child)
+        if self.children:
+            self.children.append(child)
+        else:
+            self.children = [child]
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert node to dictionary for JSON serialization."""
         result = {
             'label': self.label,
             'data': self.data,
-            'attributes': self.attributes,
+            'attributes': self.attributes or {},
             'children': [child.to_dict() for child in self.children]
         }
         return result
 
+    def to_json_dict(self) -> Dict[str, Any]:
+        """Like to_dict, but leaves the children for the JSON encoder to expand (see fast_json)."""
+        return {
+            'label': self.label,
+            'data': self.data,
+            'attributes': self.attributes or {},
+            'children': self.children
+        }
+
+
+class SerializedXmlNode(XmlNode):
+    """A subtree that was already converted to a dictionary, e.g. by an extraction worker."""
+
+    __slots__ = ('tree',)
+
+    def __init__(self, tree: Dict[str, Any]):
+        super().__init__(tree['label'], tree['data'])
+        self.tree = tree
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.tree
+
+    def to_json_dict(self) -> Dict[str, Any]:
+        return self.tree
+
 
 class XmlParserService:
     """Service for parsing Common Criteria XML files."""
     
     def __init__(self):
         self.root_node: Optional[XmlNode] = None
+        # "version" attribute of the first <cc> root read, kept for the import history
+        self.catalog_version: Optional[str] = None
         # Define table mappings based on class IDs from the XML
         self.functional_table_mappings = {
             "fau": FauDb,  # Security audit
@@ -69,117 +234,589 @@ class XmlParserService:
             "ava": AvaDb,  # Vulnerability assessment
         }
     
-    def parse_xml_file(self, xml_content: str) -> Dict[str, Any]:
+    def parse_xml_file(self, xml_content: Union[XmlSource, Sequence[XmlSource]], parallel: bool = False) -> Dict[str, Any]:
         """
         Parse XML content and return structured data.
         
         Args:
-            xml_content: String content of the XML file
+            xml_content: XML text, bytes, a filesystem path or a binary file object,
+                or a list of them merged into one tree
+            parallel: Extract each f-class/a-class in the shared process pool
             
         Returns:
             Dictionary containing the parsed XML structure
         """
+        root_node, components = self.parse_catalog(xml_content, parallel=parallel)
+        
+        return {
+            'success': True,
+            'data': root_node.to_dict() if root_node else None,
+            'components': [record._asdict() for record in components]
+        }
+
+    def parse_catalog(
+        self, xml_content: Union[XmlSource, Sequence[XmlSource]], parallel: bool = False
+    ) -> Tuple[XmlNode, List[ComponentRecord]]:
+        """
+        Build the display tree and the component records without converting them to dicts.
+        
+        A list of documents (such as the members of a zip bundle) is merged under one root.
+        """
+        walk = self.walk_catalog_parallel if parallel else self.walk_catalog
+        
+        root_node = None
+        components = []
+        for source in self._as_source_list(xml_content):
+            for component_records, _ in walk(self._parse_document(source), build_tree=True):
+                components.extend(component_records)
+            if root_node is None:
+                root_node = self.root_node
+            else:
+                for child in self.root_node.children:
+                    root_node.add_child(child)
+        self.root_node = root_node
+        return root_node, components
+    
+    def import_to_database(
+        self,
+        xml_content: Union[XmlSource, Sequence[XmlSource]],
+        db: Session,
+        stream: bool = False,
+        batch_size: Optional[int] = None,
+        incremental: bool = False,
+        parallel: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        source_name: Optional[str] = None,
+        staged: bool = False,
+        document_names: Optional[Sequence[Optional[str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Parse XML and import components to appropriate database tables.
+        
+        Args:
+            xml_content: XML text, bytes, a filesystem path or a binary file object.
+                Paths and files are read by lxml directly, without a copy in memory.
+                A list of documents is imported in a single transaction.
+            db: Database session
+            stream: Use the iterparse based streaming reader instead of building
+                the whole document in memory
+            batch_size: Rows per executemany/COPY batch (defaults to XML_IMPORT_BATCH_SIZE)
+            incremental: Reconcile with the existing rows by content hash instead of
+                appending; unchanged rows are left alone and vanished ones deleted
+            parallel: Extract each f-class/a-class in the shared process pool
+                (ignored in streaming mode)
+            progress: Optional callback receiving the phase ("parsing", "extracting",
+                "writing", "committing", "swapping") and the rows queued per table
+            source_name: File name recorded in the import history
+            staged: Replace the whole catalog: load it into staging tables and swap
+                them into the live family and element-list tables in one short
+                transaction once the import succeeded (ignored when incremental)
+            document_names: Provenance stored on the rows of each document; defaults
+                to the file name of paths and to ``source_name`` otherwise
+            
+        Returns:
+            Dictionary containing import results, including per-phase ``timings``
+        """
+        if progress:
+            progress('parsing', {})
+        sources = self._as_source_list(xml_content)
+        if source_name is None and len(sources) == 1 and isinstance(sources[0], Path):
+            source_name = sources[0].name
+        if document_names is None:
+            document_names = [source.name if isinstance(source, Path) else source_name for source in sources]
+        modes = (('stream', stream), ('parallel', parallel and not stream))
+
+        timer = PhaseTimer()
+        # Documents are parsed one after another as the writer consumes their batches
+        batches = chain.from_iterable(
+            zip(repeat(name), self._document_batches(source, stream, parallel, timer))
+            for source, name in zip(sources, document_names)
+        )
+        return self.import_batches(
+            batches, db, timer, modes=modes, batch_size=batch_size, incremental=incremental,
+            progress=progress, source_name=source_name, staged=staged,
+            multi_source=len(set(document_names)) > 1,
+        )
+
+    def import_batches(
+        self,
+        batches: Iterable[SourcedBatch],
+        db: Session,
+        timer: PhaseTimer,
+        modes: Sequence[Tuple[str, bool]] = (),
+        batch_size: Optional[int] = None,
+        incremental: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        source_name: Optional[str] = None,
+        staged: bool = False,
+        multi_source: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Write already extracted record batches and record the run in the import history.
+
+        ``timer`` should have been started before the catalog was read, and ``modes``
+        lists the reading options (name, enabled) for the history's mode string.
+        ``multi_source`` enables the first-file-wins resolution of element ids
+        defined by more than one source file; the remaining options are those of
+        :meth:`import_to_database`.
+        """
+        staged = staged and not incremental
+        mode = '+'.join(name for name, enabled in (
+            *modes, ('incremental', incremental), ('staged', staged)
+        ) if enabled) or 'default'
+
+        started_at = datetime.now(timezone.utc) - timedelta(seconds=timer.elapsed())
+        try:
+            result = self._import_records(
+                timer.iterate(batches, 'extract'), db, batch_size, incremental, progress, timer,
+                staged=staged, multi_source=multi_source,
+            )
+        except Exception as e:
+            db.rollback()
+            self._record_import_history(db, started_at, source_name, mode, None, timer, error=str(e))
+            raise
+        self._record_import_history(db, started_at, source_name, mode, result, timer)
+        return result
+
+    def _document_batches(
+        self, source: XmlSource, stream: bool, parallel: bool, timer: PhaseTimer
+    ) -> Iterator[RecordBatch]:
+        """Record batches of one document in the requested reading mode."""
+        if stream:
+            # iterparse interleaves parsing with extraction, so both count as extract
+            return self.iter_component_records(source)
+        with timer.phase('parse'):
+            xml_doc = self._parse_document(source)
+        if parallel:
+            return self.walk_catalog_parallel(xml_doc)
+        # The display tree is never needed for an import
+        return self.walk_catalog(xml_doc)
+
+    @staticmethod
+    def _as_source_list(xml_content: Union[XmlSource, Sequence[XmlSource]]) -> List[XmlSource]:
+        return list(xml_content) if isinstance(xml_content, (list, tuple)) else [xml_content]
+
+    def _parse_document(self, source: XmlSource):
+        """Parse the XML source and validate the catalog root element."""
         try:
-            xml_doc = etree.fromstring(xml_content.encode('utf-8'))
+            if isinstance(source, str):
+                xml_doc = etree.fromstring(source.encode('utf-8'), get_xml_parser())
+            elif isinstance(source, (bytes, bytearray)):
+                xml_doc = etree.fromstring(source, get_xml_parser())
+            else:
+                # Paths and file objects are read by libxml2 directly, without a Python copy
+                if isinstance(source, Path):
+                    source = str(source)
+                xml_doc = etree.parse(source, get_xml_parser()).getroot()
         except etree.XMLSyntaxError as e:
             raise ValueError(f"Invalid XML content: {str(e)}")
         
         if xml_doc.tag != 'cc':
             raise ValueError(f"Invalid root element '{xml_doc.tag}'. Expected 'cc'.")
         
-        self.root_node = XmlNode("Root")
-        self.xml_doc = xml_doc  # Store for component extraction
+        self.catalog_version = self.catalog_version or xml_doc.get('version')
+        return xml_doc
+
+    def walk_catalog(self, xml_doc, build_tree: bool = False) -> Iterator[RecordBatch]:
+        """
+        Walk the catalog once, descending class -> family -> component -> element.
+
+        The hierarchy context is carried down the walk, and one record batch is
+        yielded per component. When ``build_tree`` is set the display tree is
+        assembled on ``self.root_node`` during the same pass.
+        """
+        self.root_node = XmlNode("Root") if build_tree else None
         
         for child_element in xml_doc:
-            if child_element.tag in ['f-class', 'a-class', 'eal', 'cap']:
+            if child_element.tag in CLASS_TAGS:
+                class_node = self._create_hierarchy_node(self.root_node, child_element) if build_tree else None
+                yield from self._walk_class(child_element, class_node)
+            elif build_tree and child_element.tag in TREE_ROOT_TAGS:
                 self._create_node_from_element(self.root_node, child_element)
+
+    def walk_catalog_parallel(self, xml_doc, build_tree: bool = False) -> Iterator[RecordBatch]:
+        """
+        Same output as :meth:`walk_catalog`, with the classes extracted in worker processes.
+
+        Each f-class/a-class subtree is serialized and walked independently; the
+        results are merged back in document order.
+        """
+        self.root_node = XmlNode("Root") if build_tree else None
+
+        class_payloads = [
+            etree.tostring(child, with_tail=False) for child in xml_doc if child.tag in CLASS_TAGS
+        ]
+        # map() yields results in submission order, which is document order
+        class_results = get_extraction_pool().map(
+            _extract_class_subtree, class_payloads, repeat(build_tree)
+        )
+
+        for child_element in xml_doc:
+            if child_element.tag in CLASS_TAGS:
+                batches, class_tree = next(class_results)
+                if build_tree:
+                    self.root_node.add_child(SerializedXmlNode(class_tree))
+                yield from batches
+            elif build_tree and child_element.tag in TREE_ROOT_TAGS:
+                self._create_node_from_element(self.root_node, child_element)
+
+    def _walk_class(self, class_elem, class_node: Optional[XmlNode]) -> Iterator[RecordBatch]:
+        """Walk the families of an f-class/a-class."""
+        class_context = self._class_context(class_elem)
+        for child in class_elem:
+            if child.tag in FAMILY_TAGS:
+                family_node = self._create_hierarchy_node(class_node, child) if class_node is not None else None
+                yield from self._walk_family(child, class_context, family_node)
+            elif class_node is not None:
+                self._add_child_element(class_node, child)
+
+    def _walk_family(
+        self, family_elem, class_context: Dict[str, Any], family_node: Optional[XmlNode]
+    ) -> Iterator[RecordBatch]:
+        """Walk the components of an f-family/a-family."""
+        family_context = self._family_context(family_elem, class_context)
+        for child in family_elem:
+            if child.tag in COMPONENT_TAGS:
+                component_node = self._create_generic_node(family_node, child) if family_node is not None else None
+                yield self._walk_component(child, family_context, component_node)
+            elif family_node is not None:
+                self._add_child_element(family_node, child)
+
+    def _walk_component(
+        self, component_elem, family_context: Dict[str, Any], component_node: Optional[XmlNode] = None
+    ) -> RecordBatch:
+        """Build the component and element-list records of a single component."""
+        context = self._component_context(component_elem, family_context)
+        components = []
+        element_lists = []
         
+        for child in component_elem:
+            if child.tag in ELEMENT_TAGS:
+                component_data = self._build_component_record(child, context)
+                if self._is_valid_component(component_data):
+                    components.append(component_data)
+                if child.tag == 'f-element':
+                    element_lists.extend(self._build_element_list_records(child, context))
+            if component_node is not None:
+                self._add_child_element(component_node, child)
+        
+        return components, element_lists
+
+    @staticmethod
+    def _class_context(class_elem) -> Dict[str, Any]:
+        """Labels derived from an f-class/a-class, computed once per class."""
+        class_name = class_elem.get('name', '') if class_elem is not None else ''
+        class_id = class_elem.get('id', '') if class_elem is not None else ''
+        if not (class_name and class_id):
+            return {'class_name': '', 'class_id': '', 'path': []}
         return {
-            'success': True,
-            'data': self.root_node.to_dict() if self.root_node else None,
-            'components': self._extract_components_directly()
+            'class_name': f"{class_id} - {class_name}",
+            'class_id': class_id,
+            'path': [f"f-class - {class_name} - {class_id}"],
         }
-    
-    def import_to_database(self, xml_content: str, db: Session) -> Dict[str, Any]:
+
+    @staticmethod
+    def _family_context(family_elem, class_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Extend the class context with the family labels."""
+        family_name = family_elem.get('name', '') if family_elem is not None else ''
+        family_id = family_elem.get('id', '') if family_elem is not None else ''
+        context = dict(class_context, family='')
+        if family_name and family_id:
+            context['family'] = f"{family_id} - {family_name}"
+            context['path'] = class_context['path'] + [f"f-family - {family_name} - {family_id}"]
+        return context
+
+    @staticmethod
+    def _component_context(component_elem, family_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Extend the family context with the component labels."""
+        component_id = component_elem.get('id', '')
+        context = dict(
+            family_context,
+            component=component_id,
+            component_name=component_elem.get('name', ''),
+        )
+        if component_id:
+            context['path'] = family_context['path'] + [f"f-component - {component_id}"]
+        return context
+
+    def iter_component_records(self, source: XmlSource) -> Iterator[RecordBatch]:
         """
-        Parse XML and import components to appropriate database tables.
-        
-        Args:
-            xml_content: String content of the XML file
-            db: Database session
-            
-        Returns:
-            Dictionary containing import results
+        Stream component and element-list records using lxml iterparse.
+
+        A batch is yielded every time an f-component/a-component closes. Finished
+        subtrees are cleared straight away so memory stays flat regardless of the
+        catalog size.
         """
-        # Parse the XML first
-        parse_result = self.parse_xml_file(xml_content)
-        
-        if not parse_result['success'] or not parse_result['components']:
-            return {
-                'success': False,
-                'message': "No components found in XML file",
-                'components_imported': 0,
-                'components_failed': 0,
-                'element_lists_imported': 0,
-                'tables_used': []
-            }
+        root = None
+        depth = 0
+        try:
+            for event, element in etree.iterparse(
+                self._open_stream_source(source), events=('start', 'end'), **XML_PARSER_OPTIONS
+            ):
+                if event == 'start':
+                    if root is None:
+                        if element.tag != 'cc':
+                            raise ValueError(f"Invalid root element '{element.tag}'. Expected 'cc'.")
+                        root = element
+                        self.catalog_version = self.catalog_version or root.get('version')
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if element.tag in COMPONENT_TAGS:
+                    # Ancestors are still open, so their attributes are available here
+                    family_elem = element.getparent()
+                    class_elem = family_elem.getparent() if family_elem is not None else None
+                    family_context = self._family_context(family_elem, self._class_context(class_elem))
+                    yield self._walk_component(element, family_context)
+                    element.clear(keep_tail=True)
+                elif depth == 1:
+                    # Top-level sections (clauses, classes, EALs) are no longer needed once closed
+                    element.clear(keep_tail=True)
+                    while element.getprevious() is not None:
+                        del root[0]
+        except etree.XMLSyntaxError as e:
+            raise ValueError(f"Invalid XML content: {str(e)}")
+
+    @staticmethod
+    def _open_stream_source(source):
+        """Normalise the accepted streaming inputs into something iterparse can read."""
+        if isinstance(source, Path):
+            return str(source)
+        if isinstance(source, str):
+            return BytesIO(source.encode('utf-8'))
+        if isinstance(source, (bytes, bytearray)):
+            return BytesIO(source)
+        return source
+
+    @staticmethod
+    def _empty_import_result() -> Dict[str, Any]:
+        """Result returned when the document did not contain any components."""
+        return {
+            'success': False,
+            'message': "No components found in XML file",
+            'components_imported': 0,
+            'components_failed': 0,
+            'element_lists_imported': 0,
+            'tables_used': []
+        }
+
+    def _import_records(
+        self,
+        batches: Iterable[SourcedBatch],
+        db: Session,
+        batch_size: Optional[int] = None,
+        incremental: bool = False,
+        progress: Optional[ProgressCallback] = None,
+        timer: Optional[PhaseTimer] = None,
+        staged: bool = False,
+        multi_source: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Insert component and element-list record batches and commit once at the end.
         
+        Staged imports commit into the staging tables first and then swap them in.
+        With ``multi_source`` element ids defined by more than one source file keep
+        their first definition.
+        """
+        timer = timer or PhaseTimer()
+        ownership = ElementOwnership(enabled=multi_source)
         components_imported = 0
         components_failed = 0
         element_lists_imported = 0
         errors = []
         tables_used = set()
-        
-        # Process components and insert into appropriate tables
-        for component_data in parse_result['components']:
-            try:
-                success = self._insert_component_to_table(component_data, db)
-                if success:
-                    components_imported += 1
-                    # Track which table was used
-                    class_id = component_data.get('class_id', '')
-                    table_name = self._get_table_name_for_class_id(class_id)
-                    if table_name:
-                        tables_used.add(table_name)
-                else:
-                    components_failed += 1
-            except Exception as e:
-                components_failed += 1
-                errors.append(f"Failed to import component: {str(e)}")
-        
-        # Extract and import element lists
+        rows_processed: Dict[str, int] = {}
+        if incremental:
+            writer = IncrementalCatalogSync(db, self._catalog_table_keys(), batch_size=batch_size)
+        elif staged:
+            writer = StagedCatalogWriter(db, self.catalog_tables(), batch_size=batch_size)
+        else:
+            writer = BulkRowWriter(db, batch_size=batch_size)
+
         try:
-            element_lists = self._extract_element_lists()
-            for element_list_data in element_lists:
-                try:
-                    success = self._insert_element_list_to_db(element_list_data, db)
-                    if success:
-                        element_lists_imported += 1
-                        tables_used.add("element_list_db")
-                except Exception as e:
-                    errors.append(f"Failed to import element list: {str(e)}")
-        except Exception as e:
-            errors.append(f"Failed to extract element lists: {str(e)}")
+            for source_file, (components, element_lists) in batches:
+                with timer.phase('build_rows'):
+                    # Process components and insert into appropriate tables
+                    for component_data in components:
+                        table_name = self._get_table_name_for_class_id(component_data.class_id)
+                        if not ownership.claim(table_name or 'components', component_data.element, source_file, component_data):
+                            continue
+                        try:
+                            success = self._insert_component_to_table(component_data, writer, source_file)
+                            if success:
+                                components_imported += 1
+                                # Track which table was used
+                                if table_name:
+                                    tables_used.add(table_name)
+                                    rows_processed[table_name] = rows_processed.get(table_name, 0) + 1
+                            else:
+                                components_failed += 1
+                        except Exception as e:
+                            components_failed += 1
+                            errors.append(f"Failed to import component: {str(e)}")
+
+                    for element_list_data in element_lists:
+                        content = (element_list_data.get('element'), element_list_data.get('item_text'))
+                        if not ownership.claim('element_list_db', element_list_data.get('element_index'), source_file, content):
+                            continue
+                        try:
+                            success = self._insert_element_list_to_db(element_list_data, writer, source_file)
+                            if success:
+                                element_lists_imported += 1
+                                tables_used.add("element_list_db")
+                                rows_processed["element_list_db"] = rows_processed.get("element_list_db", 0) + 1
+                        except Exception as e:
+                            errors.append(f"Failed to import element list: {str(e)}")
+
+                if progress:
+                    progress('extracting', rows_processed)
+        except Exception:
+            # Parse errors surface while iterating; the caller reports them
+            if staged:
+                db.rollback()
+                self._discard_staging(writer, db)
+            raise
+
+        if components_imported == 0 and components_failed == 0:
+            db.rollback()
+            if staged:
+                self._discard_staging(writer, db)
+            result = self._empty_import_result()
+            result['timings'] = self._import_timings(timer, writer, rows_processed)
+            return result
         
         try:
-            db.commit()
-            return {
+            if progress:
+                progress('writing', rows_processed)
+            with timer.phase('build_rows'):
+                writer.flush()
+            if progress:
+                progress('committing', rows_processed)
+            with timer.phase('commit'):
+                db.commit()
+            if staged:
+                if progress:
+                    progress('swapping', rows_processed)
+                with timer.phase('swap'):
+                    writer.publish()
+                    db.commit()
+            result = {
                 'success': True,
                 'message': f"Successfully imported {components_imported} components and {element_lists_imported} element lists",
                 'components_imported': components_imported,
                 'components_failed': components_failed,
                 'element_lists_imported': element_lists_imported,
                 'errors': errors if errors else None,
-                'tables_used': list(tables_used)
+                'tables_used': list(tables_used),
+                'table_stats': writer.table_stats(),
+                'timings': self._import_timings(timer, writer, rows_processed),
+                'conflicts': ownership.conflicts or None,
             }
+            if incremental:
+                totals = {name: sum(stats[name] for stats in writer.sync_stats.values())
+                          for name in ('inserted', 'updated', 'deleted', 'unchanged', 'skipped')}
+                result['message'] = (
+                    f"Synchronised {components_imported} components and {element_lists_imported} element lists: "
+                    f"{totals['inserted']} inserted, {totals['updated']} updated, "
+                    f"{totals['deleted']} deleted, {totals['unchanged']} unchanged"
+                )
+                if totals['skipped']:
+                    result['message'] += f" ({totals['skipped']} kept as edited by hand)"
+                result['sync_stats'] = writer.sync_stats
+            if ownership.conflicts:
+                result['message'] += f" ({len(ownership.conflicts)} element ids defined in more than one file were skipped)"
+            return result
         except Exception as e:
             db.rollback()
+            if staged:
+                self._discard_staging(writer, db)
             raise Exception(f"Database error: {str(e)}")
     
-    def _insert_component_to_table(self, component_data: Dict[str, str], db: Session) -> bool:
-        """Insert component data into the appropriate table based on class."""
-        class_name = component_data.get('class_name', '')
-        class_id = component_data.get('class_id', '')
+    @staticmethod
+    def _import_timings(timer: PhaseTimer, writer: BulkRowWriter, rows_processed: Dict[str, int]) -> Dict[str, Any]:
+        """Seconds per phase and rows per table; batch writes are split out of row building."""
+        table_stats = writer.table_stats()
+        element_list_seconds = table_stats.get('element_list_db', {}).get('seconds', 0.0)
+        component_seconds = sum(
+            (stats['seconds'] for table_name, stats in table_stats.items() if table_name != 'element_list_db'), 0.0
+        )
+        build_seconds = max(0.0, timer.get('build_rows') - component_seconds - element_list_seconds)
+        return {
+            'parse': round(timer.get('parse'), 6),
+            'extract': round(timer.get('extract'), 6),
+            'build_rows': round(build_seconds, 6),
+            'write_components': round(component_seconds, 6),
+            'write_element_lists': round(element_list_seconds, 6),
+            'commit': round(timer.get('commit'), 6),
+            'swap': round(timer.get('swap'), 6),
+            'total': round(timer.elapsed(), 6),
+            'rows': dict(rows_processed),
+        }
+
+    def _record_import_history(
+        self,
+        db: Session,
+        started_at: datetime,
+        source_name: Optional[str],
+        mode: str,
+        result: Optional[Dict[str, Any]],
+        timer: PhaseTimer,
+        error: Optional[str] = None,
+    ) -> None:
+        """Persist one import run; a failure here never fails the import itself."""
+        result = result or {}
+        timings = result.get('timings')
+        entry = ImportHistory(
+            started_at=started_at,
+            source=(source_name or '')[:255] or None,
+            catalog_version=self.catalog_version,
+            mode=mode,
+            success=bool(result.get('success')),
+            components_imported=result.get('components_imported', 0),
+            element_lists_imported=result.get('element_lists_imported', 0),
+            total_seconds=timings['total'] if timings else round(timer.elapsed(), 6),
+            timings=json.dumps(timings) if timings else None,
+            error=error or (None if result.get('success') else result.get('message')),
+        )
+        try:
+            db.add(entry)
+            # Lets caches in other processes notice the import
+            bump_catalog_revision(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+
+    @staticmethod
+    def _discard_staging(writer: StagedCatalogWriter, db: Session) -> None:
+        """Best effort cleanup; leftovers are replaced by the next staged import anyway."""
+        try:
+            writer.discard()
+            db.commit()
+        except Exception:
+            db.rollback()
+
+    def catalog_tables(self) -> List[Any]:
+        """Tables holding the imported catalog: every family table and element_list_db."""
+        tables = [model.__table__ for model in self.functional_table_mappings.values()]
+        tables.extend(model.__table__ for model in self.assurance_table_mappings.values())
+        tables.append(ElementListDb.__table__)
+        return tables
+
+    def _catalog_table_keys(self) -> Dict[Any, str]:
+        """Every table an import writes to, with the column identifying a row across imports."""
+        tables = {model.__table__: 'element' for model in self.functional_table_mappings.values()}
+        tables.update({model.__table__: 'element' for model in self.assurance_table_mappings.values()})
+        tables[Component.__table__] = 'element'
+        tables[ElementListDb.__table__] = 'element_index'
+        return tables
+    
+    def _insert_component_to_table(
+        self, component_data: ComponentRecord, writer: BulkRowWriter, source_file: Optional[str] = None
+    ) -> bool:
+        """Queue component data for the appropriate table based on class."""
+        class_name = component_data.class_name
+        class_id = component_data.class_id
         
         if not class_name:
             return False
@@ -189,27 +826,23 @@ class XmlParserService:
         
         if not table_class:
             # Fall back to general components table
-            component = Component(
-                class_name=component_data.get('class_name', ''),
-                family=component_data.get('family'),
-                component=component_data.get('component'),
-                component_name=component_data.get('component_name'),
-                element=component_data.get('element'),
-                element_item=component_data.get('element_item')
-            )
-            db.add(component)
-            return True
+            table_class = Component
+            class_column = 'class_name'
+        else:
+            # Family tables store the class in the "class" column
+            class_column = 'class'
         
-        # Insert into specific family table
-        component = table_class(
-            class_field=component_data.get('class_name', ''),
-            family=component_data.get('family'),
-            component=component_data.get('component'),
-            component_name=component_data.get('component_name'),
-            element=component_data.get('element'),
-            element_item=component_data.get('element_item')
-        )
-        db.add(component)
+        row = {
+            class_column: class_name,
+            'family': component_data.family,
+            'component': component_data.component,
+            'component_name': component_data.component_name,
+            'element': component_data.element,
+            'element_item': component_data.element_item,
+            'source_file': source_file,
+        }
+        row['content_hash'] = compute_content_hash(row)
+        writer.add(table_class.__table__, row)
         return True
     
     def _get_table_class_for_class_id(self, class_id: str) -> Optional[Type]:
@@ -236,6 +869,11 @@ class XmlParserService:
     
     def _create_node_from_element(self, parent_node: XmlNode, element) -> None:
         """Create a node from an XML element."""
+        node = self._create_hierarchy_node(parent_node, element)
+        self._add_child_elements(node, element)
+    
+    def _create_hierarchy_node(self, parent_node: XmlNode, element) -> XmlNode:
+        """Create the labelled node for a class/family element and attach it to its parent."""
         item_label = element.tag
         family_attrs = {}
         
@@ -250,52 +888,59 @@ class XmlParserService:
             item_label += ' - ' + ' '.join([f"{key}={value}" for key, value in family_attrs.items()])
         
         node = XmlNode(item_label)
-        node.attributes = dict(element.attrib)
+        if element.attrib:
+            node.attributes = dict(element.attrib)
         
         # Remove extra whitespaces for f-family and a-family elements
-        if element.tag in ('f-family', 'a-family'):
-            node.label = re.sub(r'\s+', ' ', node.label)
+        if element.tag in FAMILY_TAGS:
+            node.label = WHITESPACE_RE.sub(' ', node.label)
         
-        self._add_child_elements(node, element)
         parent_node.add_child(node)
+        return node
     
     def _add_child_elements(self, parent_node: XmlNode, element) -> None:
         """Add child elements to a parent node."""
         for child_element in element:
-            if child_element.tag in ['f-class', 'a-class', 'f-family', 'a-family']:
-                self._create_node_from_element(parent_node, child_element)
-            else:
-                item_label = str(child_element.tag)
-                if 'id' in child_element.attrib:
-                    item_label += f" - {child_element.attrib['id']}"
-                
-                node = XmlNode(item_label)
-                node.attributes = dict(child_element.attrib)
-                
-                # Add attributes as child nodes
-                for key, value in child_element.attrib.items():
-                    if key != 'id':
-                        attr_node = XmlNode(f"{key} = {value}")
-                        node.add_child(attr_node)
-                
-                self._add_text_and_tail_to_node(node, child_element)
-                self._add_child_elements(node, child_element)
-                parent_node.add_child(node)
+            self._add_child_element(parent_node, child_element)
+    
+    def _add_child_element(self, parent_node: XmlNode, child_element) -> None:
+        """Add a single child element, and everything below it, to a parent node."""
+        if child_element.tag in CLASS_TAGS or child_element.tag in FAMILY_TAGS:
+            self._create_node_from_element(parent_node, child_element)
+        else:
+            node = self._create_generic_node(parent_node, child_element)
+            self._add_child_elements(node, child_element)
+    
+    def _create_generic_node(self, parent_node: XmlNode, child_element) -> XmlNode:
+        """Create the node for a non-hierarchy element with its attribute and text nodes."""
+        item_label = str(child_element.tag)
+        if 'id' in child_element.attrib:
+            item_label += f" - {child_element.attrib['id']}"
+        
+        node = XmlNode(item_label)
+        if child_element.attrib:
+            node.attributes = dict(child_element.attrib)
+        
+        # Add attributes as child nodes
+        for key, value in child_element.attrib.items():
+            if key != 'id':
+                attr_node = XmlNode(f"{key} = {value}")
+                node.add_child(attr_node)
+        
+        self._add_text_and_tail_to_node(node, child_element)
+        parent_node.add_child(node)
+        return node
     
     def _add_text_and_tail_to_node(self, node: XmlNode, element) -> None:
         """Add text content from element to node."""
         if element.text and element.text.strip():
-            text = element.text.strip()
             if element.tag == 'f-element':
-                text = self._parse_fe_element_text(element)
-            text = self._remove_newlines_and_extra_whitespaces(text)
-            data_node = XmlNode(text)
-            node.add_child(data_node)
+                text = FE_ELEMENT_TEXT(element)
+            else:
+                text = normalize_whitespace(element.text)
+            node.add_child(XmlNode(text))
         elif element.tail and element.tail.strip():
-            text = element.tail.strip()
-            text = self._remove_newlines_and_extra_whitespaces(text)
-            data_node = XmlNode(text)
-            node.add_child(data_node)
+            node.add_child(XmlNode(normalize_whitespace(element.tail)))
         
         # Handle nested elements
         for child in element:
@@ -306,354 +951,87 @@ class XmlParserService:
         """Parse fe-list element and its children."""
         for child in element:
             if child.tag == 'fe-item':
-                text = child.text.strip() if child.text else ''
-                for sub_child in child:
-                    if sub_child.tag == 'fe-selection':
-                        text += f' [selection: {self._parse_fe_selection(sub_child)}]'
-                    elif sub_child.tag == 'fe-assignment':
-                        fe_item = sub_child.find("fe-assignmentitem")
-                        if fe_item is not None and fe_item.text:
-                            text += f' [assignment: {fe_item.text.strip()}]'
-                    # Add tail text processing - this was missing!
-                    if sub_child.tail and sub_child.tail.strip():
-                        text += ' ' + self._remove_newlines_and_extra_whitespaces(sub_child.tail.strip())
-                text = self._remove_newlines_and_extra_whitespaces(text)
-                data_node = XmlNode(text)
-                node.add_child(data_node)
-    
-    def _parse_fe_selection(self, element) -> str:
-        """Parse fe-selection element and return selection items text."""
-        items_text = []
-        for child in element:
-            if child.tag == 'fe-selectionitem':
-                if child.text:
-                    items_text.append(child.text.strip())
-            elif child.tag == 'fe-selectionnotes':
-                items_text.append(self._parse_fe_selection(child))
-        return ', '.join(filter(None, items_text))
-    
-    def _parse_fe_element_text(self, element) -> str:
-        """Parse text of an f-element that may contain assignment/assignmentitem and/or selection elements."""
-        text = element.text.strip() if element.text else ''
-        
-        for child in element:
-            if child.tag == 'assignment':
-                # Handle assignment elements (modern XML format)
-                assign_item = child.find("assignmentitem")
-                if assign_item is not None and assign_item.text:
-                    text += f' [assignment: {assign_item.text.strip()}]'
-                if child.tail and child.tail.strip():
-                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
-            elif child.tag == 'fe-assignment':
-                # Handle fe-assignment elements (legacy format)
-                fe_item = child.find("fe-assignmentitem")
-                if fe_item is not None and fe_item.text:
-                    text += f' [assignment: {fe_item.text.strip()}]'
-                if child.tail and child.tail.strip():
-                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
-            elif child.tag == 'fe-selection':
-                text += ' [selection: '
-                selection_items = child.findall('fe-selectionitem')
-                items_text = [item.text.strip() for item in selection_items if item.text and item.text.strip()]
-                if items_text:
-                    text += ', '.join(items_text)
-                    assignments = child.findall(".//fe-assignmentitem")
-                    if assignments:
-                        assignment_text = [f"[assignment: {assign.text.strip()}]" for assign in assignments if assign.text]
-                        if assignment_text:
-                            text += ', ' + ', '.join(assignment_text)
-                    text += ']'
-                if child.tail and child.tail.strip():
-                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
-            elif child.tail and child.tail.strip():
-                text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
-        
-        return text
+                node.add_child(XmlNode(FE_ITEM_TEXT(child)))
     
-    def _remove_newlines_and_extra_whitespaces(self, text: str) -> str:
-        """Remove newlines and extra whitespace characters."""
-        return re.sub(r'\s+', ' ', text.strip())
-    
-    def _extract_components_directly(self) -> List[Dict[str, str]]:
-        """Extract component data directly from the XML document."""
-        components = []
-        
-        if not hasattr(self, 'xml_doc'):
-            return components
-        
-        # Find all f-element tags and assurance evidence elements in the XML
-        element_query = './/f-element | .//a-element | .//ae-developer | .//ae-content | .//ae-evaluator'
-        for element in self.xml_doc.xpath(element_query):
-            component_data = self._extract_component_from_element(element)
-            if self._is_valid_component(component_data):
-                components.append(component_data)
-        
-        return components
-    
-    def _extract_component_from_element(self, element) -> Dict[str, str]:
-        """Extract component information from an f-element or a-element."""
-        component_data = {
-            'class_name': '',
-            'class_id': '',
-            'family': '',
-            'component': '',
-            'component_name': '',
-            'element': '',
-            'element_item': ''
-        }
-        
+    def _build_component_record(self, element, context: Dict[str, Any]) -> ComponentRecord:
+        """Build the component record of an f-element, a-element or ae-* element."""
         # Get element ID
         element_id = element.get('id', '')
-        component_data['element'] = element_id
         
         # Extract class_id from element_id (e.g., "fpr" from "fpr_ano.2.1")
-        if '_' in element_id:
-            component_data['class_id'] = element_id.split('_')[0]
-        
-        # Find parent hierarchy
-        component_elem = element.getparent()  # f-component
-        family_elem = component_elem.getparent() if component_elem is not None else None  # f-family
-        class_elem = family_elem.getparent() if family_elem is not None else None  # f-class
-        
-        # Extract class information
-        if class_elem is not None:
-            class_name = class_elem.get('name', '')
-            class_id = class_elem.get('id', '')
-            if class_name and class_id:
-                component_data['class_name'] = f"{class_id} - {class_name}"
-                if not component_data['class_id']:
-                    component_data['class_id'] = class_id
-        
-        # Extract family information
-        if family_elem is not None:
-            family_name = family_elem.get('name', '')
-            family_id = family_elem.get('id', '')
-            if family_name and family_id:
-                component_data['family'] = f"{family_id} - {family_name}"
-        
-        # Extract component information
-        if component_elem is not None:
-            component_id = component_elem.get('id', '')
-            component_name = component_elem.get('name', '')
-            component_data['component'] = component_id
-            component_data['component_name'] = component_name
-        
-        # Extract element_item using the corrected parsing method
-        element_text = self._parse_element_text_content(element)
-        component_data['element_item'] = element_text
-        
-        return component_data
+        class_id = element_id.split('_')[0] if '_' in element_id else context['class_id']
+        
+        return ComponentRecord(
+            class_name=context['class_name'],
+            class_id=class_id,
+            family=context['family'],
+            component=context['component'],
+            component_name=context['component_name'],
+            element=element_id,
+            element_item=element_text(element),
+        )
     
-    def _parse_element_text_content(self, element) -> str:
-        """Parse the complete text content of an element including assignments."""
-
-        # Assurance evidence elements (ae-*) should only capture their direct requirement text.
-        if element.tag.startswith('ae-'):
-            assurance_text = self._extract_assurance_text(element)
-            if assurance_text:
-                return assurance_text
-
-        parts: List[str] = []
-
-        if element.text and element.text.strip():
-            parts.append(self._remove_newlines_and_extra_whitespaces(element.text))
-
-        for child in element:
-            if child.tag == 'assignment':
-                assign_item = child.find("assignmentitem")
-                if assign_item is not None and assign_item.text:
-                    parts.append(f"[assignment: {self._remove_newlines_and_extra_whitespaces(assign_item.text)}]")
-                if child.tail and child.tail.strip():
-                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-                continue
-            if child.tag == 'fe-assignment':
-                fe_item = child.find("fe-assignmentitem")
-                if fe_item is not None and fe_item.text:
-                    parts.append(f"[assignment: {self._remove_newlines_and_extra_whitespaces(fe_item.text)}]")
-                if child.tail and child.tail.strip():
-                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-                continue
-            if child.tag == 'fe-selection':
-                selection_items = child.findall('fe-selectionitem')
-                items_text = [item.text.strip() for item in selection_items if item.text and item.text.strip()]
-                if items_text:
-                    parts.append(f"[selection: {', '.join(items_text)}]")
-                if child.tail and child.tail.strip():
-                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-                continue
-
-            nested_text = self._parse_element_text_content(child)
-            if nested_text:
-                parts.append(nested_text)
-
-            if child.tail and child.tail.strip():
-                parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-
-        combined = ' '.join(part for part in parts if part)
-        return self._remove_newlines_and_extra_whitespaces(combined)
-
-    def _extract_assurance_text(self, element) -> str:
-        """Collect only the primary requirement text for assurance evidence elements."""
-        parts: List[str] = []
-
-        if element.text and element.text.strip():
-            parts.append(self._remove_newlines_and_extra_whitespaces(element.text))
-
-        for child in element:
-            # Skip detailed evaluator work units such as m-workunit and similar blocks
-            if self._is_assurance_detail_element(child.tag):
-                if child.tail and child.tail.strip():
-                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-                continue
-
-            inline_text = self._extract_assurance_text(child)
-            if inline_text:
-                parts.append(inline_text)
-
-            if child.tail and child.tail.strip():
-                parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
-
-        if not parts:
-            return ""
-
-        combined = ' '.join(part for part in parts if part)
-        return self._remove_newlines_and_extra_whitespaces(combined)
-
-    @staticmethod
-    def _is_assurance_detail_element(tag: str) -> bool:
-        """Identify tags that contain evaluator work units or detailed guidance."""
-        if not tag:
-            return False
-
-        if tag.startswith('m-'):
-            return True
-
-        return tag == 'ae-dc-element'
-
-    def _is_valid_component(self, component_data: Dict[str, str]) -> bool:
+    def _is_valid_component(self, component_data: ComponentRecord) -> bool:
         """Check if component data has sufficient information to be valid."""
-        return bool(component_data.get('element') and component_data.get('element_item'))
+        return bool(component_data.element and component_data.element_item)
     
-    def _extract_element_lists(self) -> List[Dict[str, Any]]:
-        """Extract element list data from the XML document for populating element_list_db."""
+    def _build_element_list_records(self, f_element, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build element_list_db records for the fe-list items of an f-element."""
         element_lists = []
+        element_id = f_element.get('id', '')
         
-        if not hasattr(self, 'xml_doc'):
+        # Find the fe-list within this f-element
+        fe_list = f_element.find('fe-list')
+        if not element_id or fe_list is None:
             return element_lists
         
-        # Find all f-element tags that contain fe-list elements
-        for f_element in self.xml_doc.xpath('.//f-element[fe-list]'):
-            element_id = f_element.get('id', '')
-            
-            if not element_id:
-                continue
-            
-            # Extract hierarchy for this element
-            hierarchy_path = self._get_element_hierarchy_path(f_element)
-            
-            # Get the main element text (before fe-list)
-            main_text = f_element.text.strip() if f_element.text else ''
-            
-            # Find the fe-list within this f-element
-            fe_list = f_element.find('fe-list')
-            if fe_list is not None:
-                order = 1
-                for fe_item in fe_list.findall('fe-item'):
-                    item_text = self._parse_fe_item_text(fe_item)
-                    if item_text.strip():  # Only add non-empty items
-                        element_index = f"{element_id}_{order}"
-                        
-                        # Format with letter prefix (a, b, c, etc.)
-                        letter = chr(ord('a') + order - 1)
-                        formatted_item = f"{letter}. {item_text.strip()}"
-                        
-                        element_list_data = {
-                            'element': element_id,
-                            'element_index': element_index,
-                            'item_list': hierarchy_path,
-                            'item_text': formatted_item,
-                            'main_text': main_text
-                        }
-                        element_lists.append(element_list_data)
-                        order += 1
+        # Hierarchy path similar to the old parser format
+        hierarchy_path = '>'.join(context['path'] + [f"f-element - {element_id}"])
         
-        return element_lists
-    
-    def _get_element_hierarchy_path(self, f_element) -> str:
-        """Get the hierarchy path for an f-element."""
-        # Find parent hierarchy
-        component_elem = f_element.getparent()  # f-component
-        family_elem = component_elem.getparent() if component_elem is not None else None  # f-family
-        class_elem = family_elem.getparent() if family_elem is not None else None  # f-class
-        
-        path_parts = []
-        
-        # Build hierarchy path similar to the old parser format
-        if class_elem is not None:
-            class_name = class_elem.get('name', '')
-            class_id = class_elem.get('id', '')
-            if class_name and class_id:
-                path_parts.append(f"f-class - {class_name} - {class_id}")
-        
-        if family_elem is not None:
-            family_name = family_elem.get('name', '')
-            family_id = family_elem.get('id', '')
-            if family_name and family_id:
-                path_parts.append(f"f-family - {family_name} - {family_id}")
-        
-        if component_elem is not None:
-            component_id = component_elem.get('id', '')
-            component_name = component_elem.get('name', '')
-            if component_id:
-                path_parts.append(f"f-component - {component_id}")
+        # Get the main element text (before fe-list)
+        main_text = f_element.text.strip() if f_element.text else ''
         
-        element_id = f_element.get('id', '')
-        if element_id:
-            path_parts.append(f"f-element - {element_id}")
+        order = 1
+        for fe_item in fe_list.findall('fe-item'):
+            item_text = FE_ITEM_TEXT(fe_item)
+            if item_text.strip():  # Only add non-empty items
+                element_index = f"{element_id}_{order}"
+                
+                # Format with letter prefix (a, b, c, etc.)
+                letter = chr(ord('a') + order - 1)
+                formatted_item = f"{letter}. {item_text.strip()}"
+                
+                element_list_data = {
+                    'element': element_id,
+                    'element_index': element_index,
+                    'item_list': hierarchy_path,
+                    'item_text': formatted_item,
+                    'main_text': main_text
+                }
+                element_lists.append(element_list_data)
+                order += 1
         
-        return '>'.join(path_parts)
-    
-    def _parse_fe_item_text(self, fe_item) -> str:
-        """Parse the text content of a fe-item element."""
-        text = fe_item.text.strip() if fe_item.text else ''
-        
-        # Process child elements within fe-item
-        for child in fe_item:
-            if child.tag == 'fe-selection':
-                text += f' [selection: {self._parse_fe_selection(child)}]'
-            elif child.tag == 'fe-assignment':
-                fe_assignment_item = child.find("fe-assignmentitem")
-                if fe_assignment_item is not None and fe_assignment_item.text:
-                    text += f' [assignment: {fe_assignment_item.text.strip()}]'
-            # Add tail text after child elements
-            if child.tail and child.tail.strip():
-                text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
-        
-        return self._remove_newlines_and_extra_whitespaces(text)
+        return element_lists
     
-    def _insert_element_list_to_db(self, element_list_data: Dict[str, Any], db: Session) -> bool:
-        """Insert element list data into the element_list_db table."""
-        try:
-            # Check if the element_index already exists
-            existing = db.query(ElementListDb).filter(
-                ElementListDb.element_index == element_list_data['element_index']
-            ).first()
-            
-            if existing:
-                # Update existing record
-                existing.item_list = element_list_data['item_text']
-                db.add(existing)
-            else:
-                # Create new record
-                element_list = ElementListDb(
-                    element=element_list_data['element'],
-                    element_index=element_list_data['element_index'],
-                    item_list=element_list_data['item_text']
-                )
-                db.add(element_list)
-            
-            return True
-        except Exception as e:
-            # Log error but don't fail the entire import
-            print(f"Error inserting element list: {str(e)}")
-            return False
\ No newline at end of file
+    def _insert_element_list_to_db(
+        self, element_list_data: Dict[str, Any], writer: BulkRowWriter, source_file: Optional[str] = None
+    ) -> bool:
+        """Queue element list data for a set-based upsert into element_list_db."""
+        if not element_list_data.get('element_index'):
+            return False
+
+        row = {
+            'element': element_list_data['element'],
+            'element_index': element_list_data['element_index'],
+            'item_list': element_list_data['item_text'],
+            'source_file': source_file,
+        }
+        row['content_hash'] = compute_content_hash(row)
+        # Existing rows keyed on element_index only get their item_list refreshed
+        writer.upsert(
+            ElementListDb.__table__,
+            row,
+            key='element_index',
+            update_columns=('item_list', 'source_file', 'content_hash'),
+        )
+        return True
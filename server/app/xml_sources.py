@@ -0,0 +1,188 @@
+"""
+Plain and compressed catalog inputs.
+Catalogs can arrive as ``.xml`` files, gzip compressed ``.xml.gz`` files or ``.zip``
+bundles holding one or more XML documents. Compressed members are decompressed as
+streams that lxml reads directly; nothing is extracted to disk or buffered whole.
+Several catalog files (a base catalog plus protection profiles and extended
+components) can be imported together, each parsed in its own worker process.
+"""
+import gzip
+import zipfile
+from contextlib import ExitStack, contextmanager
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from .import_timing import PhaseTimer
+from .xml_parser_service import RecordBatch, SourcedBatch, XmlParserService, XmlSource, get_extraction_pool
+
+
+CATALOG_SUFFIXES = ('.xml', '.xml.gz', '.zip')
+CATALOG_SUFFIX_HINT = ', '.join(CATALOG_SUFFIXES)
+
+
+def catalog_format(filename: Optional[str]) -> Optional[str]:
+    """``"xml"``, ``"gzip"`` or ``"zip"`` from the file name, or None when unsupported."""
+    name = (filename or '').lower()
+    if name.endswith('.xml'):
+        return 'xml'
+    if name.endswith('.xml.gz'):
+        return 'gzip'
+    if name.endswith('.zip'):
+        return 'zip'
+    return None
+
+
+def _is_xml_member(info: zipfile.ZipInfo) -> bool:
+    path = PurePosixPath(info.filename)
+    # Skip folders and the metadata macOS adds to archives
+    return (
+        not info.is_dir()
+        and path.suffix.lower() == '.xml'
+        and '__MACOSX' not in path.parts
+        and not path.name.startswith('.')
+    )
+
+
+@contextmanager
+def open_catalog_sources(source: Union[XmlSource, Path], filename: Optional[str] = None) -> Iterator[List[XmlSource]]:
+    """
+    Open the XML documents held by ``source`` for parsing.
+
+    Args:
+        source: Filesystem path, binary file object or bytes of the upload
+        filename: Name used to detect the format; defaults to the path name
+
+    Yields:
+        The documents in archive order. Plain XML is passed through untouched,
+        compressed members are open decompression streams closed on exit.
+    """
+    if filename is None and isinstance(source, Path):
+        filename = source.name
+    kind = catalog_format(filename)
+    if kind is None:
+        raise ValueError(f"Unsupported catalog file '{filename}'. Expected one of: {CATALOG_SUFFIX_HINT}")
+    if kind == 'xml':
+        yield [source]
+        return
+
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    with ExitStack() as stack:
+        if kind == 'gzip':
+            document = stack.enter_context(gzip.open(source, 'rb'))
+            try:
+                # Reads the gzip header so a mislabelled upload fails before parsing starts
+                document.peek(1)
+            except (OSError, EOFError) as e:
+                raise ValueError(f"Invalid gzip file: {str(e)}")
+            documents = [document]
+        else:
+            try:
+                archive = stack.enter_context(zipfile.ZipFile(source))
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"Invalid zip archive: {str(e)}")
+            members = [info for info in archive.infolist() if _is_xml_member(info)]
+            if not members:
+                raise ValueError("The zip archive does not contain any XML files")
+            documents = [stack.enter_context(archive.open(info)) for info in members]
+        yield documents
+
+
+def document_names(documents: Sequence[XmlSource], filename: Optional[str]) -> List[Optional[str]]:
+    """Provenance of each opened document: the file name, or ``archive.zip:member.xml`` for zip members."""
+    return [
+        f"{filename}:{document.name}" if isinstance(document, zipfile.ZipExtFile) else filename
+        for document in documents
+    ]
+
+
+def import_catalog(source: Union[XmlSource, Path], filename: Optional[str], db: Session, **options: Any) -> Dict[str, Any]:
+    """Import every document of a plain or compressed catalog in one transaction."""
+    if filename is None and isinstance(source, Path):
+        filename = source.name
+    with open_catalog_sources(source, filename) as documents:
+        return XmlParserService().import_to_database(
+            documents, db, source_name=filename, document_names=document_names(documents, filename), **options
+        )
+
+
+def expand_catalog_paths(paths: Iterable[Union[str, Path]]) -> List[Path]:
+    """
+    Catalog files named directly or found in the given directories.
+
+    Directories are searched recursively and their catalogs sorted by path; the
+    order of the arguments is kept, and a file named twice is only listed once.
+    """
+    expanded: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            expanded.extend(sorted(
+                candidate for candidate in path.rglob('*')
+                if candidate.is_file() and catalog_format(candidate.name) and not candidate.name.startswith('.')
+            ))
+        else:
+            expanded.append(path)
+    return list(dict.fromkeys(expanded))
+
+
+def _extract_catalog_file(path: str, stream: bool) -> Tuple[List[Tuple[Optional[str], List[RecordBatch]]], Optional[str]]:
+    """Worker entry point: parse and walk every document of one catalog file."""
+    service = XmlParserService()
+    with open_catalog_sources(Path(path)) as documents:
+        extracted = [
+            (name, list(
+                service.iter_component_records(document) if stream
+                else service.walk_catalog(service._parse_document(document))
+            ))
+            for name, document in zip(document_names(documents, Path(path).name), documents)
+        ]
+    return extracted, service.catalog_version
+
+
+def import_catalog_files(
+    paths: Sequence[Union[str, Path]],
+    db: Session,
+    parallel: bool = False,
+    stream: bool = False,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Import several catalog files in one transaction through a single batched writer.
+
+    Every row records the file (or zip member) it came from in ``source_file``.
+    When an element id is defined by more than one file, the first file in
+    ``paths`` wins and the others are listed in the result's ``conflicts``.
+
+    Args:
+        paths: Catalog files in priority order (see :func:`expand_catalog_paths`)
+        db: Database session
+        parallel: Parse and extract each file in the shared process pool while the
+            rows of earlier files are being written
+        stream: Read each document with iterparse
+        options: Remaining :meth:`XmlParserService.import_to_database` options
+    """
+    paths = [Path(path) for path in paths]
+    if len(paths) == 1:
+        return import_catalog(paths[0], None, db, parallel=parallel, stream=stream, **options)
+
+    timer = PhaseTimer()
+    service = XmlParserService()
+    arguments = ([str(path) for path in paths], [stream] * len(paths))
+    # map() yields in submission order, so conflicts resolve the same way on every run
+    extracted = get_extraction_pool().map(_extract_catalog_file, *arguments) if parallel else map(_extract_catalog_file, *arguments)
+
+    def batches() -> Iterator[SourcedBatch]:
+        for documents, catalog_version in extracted:
+            if service.catalog_version is None:
+                service.catalog_version = catalog_version
+            for name, document_batches in documents:
+                for batch in document_batches:
+                    yield name, batch
+
+    return service.import_batches(
+        batches(), db, timer, modes=(('stream', stream), ('parallel', parallel)),
+        source_name=', '.join(path.name for path in paths), multi_source=True, **options,
+    )
@@ -0,0 +1 @@
+"""Performance benchmarks for the XML parser and catalog import; run from the server directory."""
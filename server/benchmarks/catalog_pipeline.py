@@ -0,0 +1,228 @@
+"""
+Wall time, peak RSS and throughput of catalog parsing, extraction and import.
+
+Every phase runs against cc.xml and synthetic catalogs with each class replicated
+(x10 and x100 by default; replica ids get a ``-rN`` suffix so they stay unique),
+importing into SQLite and, when a URL is given, PostgreSQL. Each measurement runs
+in a fresh interpreter so the peak RSS belongs to that phase alone:
+
+    python -m benchmarks.catalog_pipeline [--scales 1 10 100] [--postgres-url URL] [--output results.json]
+
+The PostgreSQL tables are dropped and recreated before every import, so point the
+URL at a scratch database.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+
+DEFAULT_XML = Path(__file__).resolve().parents[2] / "oldparser" / "cc.xml"
+CLASS_TAGS = ('f-class', 'a-class')
+FILE_PHASES = ('parse', 'extract')
+IMPORT_PHASES = ('import', 'import_stream')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def replicate_class(class_elem, replica: int):
+    """Copy of a class whose descendant ids are made unique; the class id still selects the table."""
+    if replica == 0:
+        return class_elem
+    copy = deepcopy(class_elem)
+    for element in copy.iterdescendants():
+        element_id = element.get('id')
+        if element_id:
+            element.set('id', f"{element_id}-r{replica}")
+    return copy
+
+
+def build_corpus(source: Path, scale: int, directory: Path) -> Path:
+    """Write (once) a catalog with every f-class/a-class repeated ``scale`` times."""
+    if scale == 1:
+        return source
+    target = directory / f"{source.stem}-x{scale}.xml"
+    if target.exists():
+        return target
+
+    root = etree.parse(str(source)).getroot()
+    partial = target.with_suffix(".partial")
+    # Written incrementally so the scaled document never exists in memory
+    with etree.xmlfile(str(partial), encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element(root.tag, dict(root.attrib)):
+            for child in root:
+                if child.tag in CLASS_TAGS:
+                    for replica in range(scale):
+                        xf.write(replicate_class(child, replica))
+                else:
+                    xf.write(child)
+    partial.replace(target)
+    return target
+
+
+def run_phase(phase: str, xml_path: Path) -> Dict[str, Any]:
+    """Measure one phase in this process; DATABASE_URL must be set before the app is imported."""
+    from app.xml_parser_service import XmlParserService
+
+    baseline = peak_rss_mb()
+    service = XmlParserService()
+    timings = None
+    if phase == 'parse':
+        started = time.perf_counter()
+        document = service._parse_document(xml_path)
+        seconds = time.perf_counter() - started
+        # Elements per second for the parse phase
+        rows = sum(1 for _ in document.iter())
+    elif phase == 'extract':
+        document = service._parse_document(xml_path)
+        started = time.perf_counter()
+        rows = sum(len(components) + len(element_lists) for components, element_lists in service.walk_catalog(document))
+        seconds = time.perf_counter() - started
+    else:
+        from app.database import Base, SessionLocal, add_missing_columns, engine
+        from app.full_text import ensure_search_indexes
+        from app.xml_sources import import_catalog
+        import app.models  # noqa: F401  (registers the tables)
+
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        add_missing_columns(engine)
+        # Imports pay for keeping the search indexes current, as they do in the app
+        ensure_search_indexes(engine)
+        session = SessionLocal()
+        try:
+            started = time.perf_counter()
+            result = import_catalog(xml_path, None, session, stream=phase == 'import_stream')
+            seconds = time.perf_counter() - started
+        finally:
+            session.close()
+        if not result.get('success'):
+            raise RuntimeError(result.get('message') or "Import failed")
+        rows = result['components_imported'] + result['element_lists_imported']
+        timings = result.get('timings')
+
+    return {
+        "seconds": seconds,
+        "rows": rows,
+        "rows_per_second": rows / seconds if seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": baseline,
+        # Phase breakdown reported by the import itself
+        "timings": timings,
+    }
+
+
+def measure(phase: str, xml_path: Path, database_url: Optional[str], repeat: int) -> Dict[str, Any]:
+    """Best of ``repeat`` runs, each in a fresh interpreter."""
+    runs: List[Dict[str, Any]] = []
+    for _ in range(repeat):
+        env = dict(os.environ)
+        scratch = None
+        if database_url is None:
+            scratch = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+            scratch.close()
+            env["DATABASE_URL"] = f"sqlite:///{scratch.name}"
+        else:
+            env["DATABASE_URL"] = database_url
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.catalog_pipeline", "--run-phase", phase, "--xml", str(xml_path)],
+                cwd=Path(__file__).resolve().parents[1], env=env, capture_output=True, text=True, check=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise SystemExit(f"{phase} on {xml_path.name} failed:\n{e.stderr}")
+        finally:
+            if scratch is not None:
+                os.unlink(scratch.name)
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    best = min(runs, key=lambda run: run["seconds"])
+    return {**best, "runs_seconds": [run["seconds"] for run in runs]}
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--xml", default=str(DEFAULT_XML), help="Base catalog (defaults to cc.xml)")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Class replication factors")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per measurement; the fastest is reported")
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"),
+                        help="Scratch PostgreSQL database to import into as well (or BENCH_POSTGRES_URL)")
+    parser.add_argument("--work-dir", default=str(Path(tempfile.gettempdir()) / "ccgentool2_bench"),
+                        help="Where the scaled catalogs are generated and kept between runs")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--run-phase", choices=FILE_PHASES + IMPORT_PHASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_phase:
+        print(json.dumps(run_phase(args.run_phase, Path(args.xml))))
+        return 0
+
+    databases = {"sqlite": None}
+    if args.postgres_url:
+        databases["postgresql"] = args.postgres_url
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    print(f"{'corpus':<14} {'database':<10} {'phase':<14} {'rows':>9} {'time':>9} {'rows/s':>10} {'peak RSS':>10}")
+    for scale in args.scales:
+        corpus = build_corpus(Path(args.xml), scale, work_dir)
+        plan = [(phase, "-", None) for phase in FILE_PHASES]
+        plan += [(phase, name, url) for name, url in databases.items() for phase in IMPORT_PHASES]
+        for phase, database, url in plan:
+            result = {
+                "corpus": corpus.name,
+                "scale": scale,
+                "size_bytes": corpus.stat().st_size,
+                "database": database if phase in IMPORT_PHASES else None,
+                "phase": phase,
+                **measure(phase, corpus, url, args.repeat),
+            }
+            results.append(result)
+            print(
+                f"{'x' + str(scale):<14} {database:<10} {phase:<14} {result['rows']:>9} "
+                f"{result['seconds']:>8.2f}s {result['rows_per_second'] or 0:>10,.0f} {result['peak_rss_mb']:>8.1f}MB"
+            )
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "lxml": ".".join(map(str, etree.LXML_VERSION)),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nresults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Speed of the table-driven text assembler against the per-call-site extraction it replaced.
+
+Checks that every requirement element, f-element and fe-item of the catalog produces
+exactly the same text with both implementations, then times them:
+
+    python -m benchmarks.text_assembly [--xml PATH] [--repeat N]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from lxml import etree
+
+from app.text_assembly import FE_ELEMENT_TEXT, FE_ITEM_TEXT, element_text
+from app.xml_parser_service import ELEMENT_TAGS
+
+
+DEFAULT_XML = Path(__file__).resolve().parents[2] / "oldparser" / "cc.xml"
+
+
+class LegacyTextExtraction:
+    """The XmlParserService text methods before the shared assembler, kept verbatim."""
+
+    def _parse_fe_selection(self, element) -> str:
+        """Parse fe-selection element and return selection items text."""
+        items_text = []
+        for child in element:
+            if child.tag == 'fe-selectionitem':
+                if child.text:
+                    items_text.append(child.text.strip())
+            elif child.tag == 'fe-selectionnotes':
+                items_text.append(self._parse_fe_selection(child))
+        return ', '.join(filter(None, items_text))
+
+    def _parse_fe_element_text(self, element) -> str:
+        """Parse text of an f-element that may contain assignment/assignmentitem and/or selection elements."""
+        text = element.text.strip() if element.text else ''
+
+        for child in element:
+            if child.tag == 'assignment':
+                # Handle assignment elements (modern XML format)
+                assign_item = child.find("assignmentitem")
+                if assign_item is not None and assign_item.text:
+                    text += f' [assignment: {assign_item.text.strip()}]'
+                if child.tail and child.tail.strip():
+                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
+            elif child.tag == 'fe-assignment':
+                # Handle fe-assignment elements (legacy format)
+                fe_item = child.find("fe-assignmentitem")
+                if fe_item is not None and fe_item.text:
+                    text += f' [assignment: {fe_item.text.strip()}]'
+                if child.tail and child.tail.strip():
+                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
+            elif child.tag == 'fe-selection':
+                text += ' [selection: '
+                selection_items = child.findall('fe-selectionitem')
+                items_text = [item.text.strip() for item in selection_items if item.text and item.text.strip()]
+                if items_text:
+                    text += ', '.join(items_text)
+                    assignments = child.findall(".//fe-assignmentitem")
+                    if assignments:
+                        assignment_text = [f"[assignment: {assign.text.strip()}]" for assign in assignments if assign.text]
+                        if assignment_text:
+                            text += ', ' + ', '.join(assignment_text)
+                    text += ']'
+                if child.tail and child.tail.strip():
+                    text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
+            elif child.tail and child.tail.strip():
+                text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
+
+        return text
+
+    def _remove_newlines_and_extra_whitespaces(self, text: str) -> str:
+        """Remove newlines and extra whitespace characters."""
+        return re.sub(r'\s+', ' ', text.strip())
+
+    def _parse_element_text_content(self, element) -> str:
+        """Parse the complete text content of an element including assignments."""
+
+        # Assurance evidence elements (ae-*) should only capture their direct requirement text.
+        if element.tag.startswith('ae-'):
+            assurance_text = self._extract_assurance_text(element)
+            if assurance_text:
+                return assurance_text
+
+        parts: List[str] = []
+
+        if element.text and element.text.strip():
+            parts.append(self._remove_newlines_and_extra_whitespaces(element.text))
+
+        for child in element:
+            if child.tag == 'assignment':
+                assign_item = child.find("assignmentitem")
+                if assign_item is not None and assign_item.text:
+                    parts.append(f"[assignment: {self._remove_newlines_and_extra_whitespaces(assign_item.text)}]")
+                if child.tail and child.tail.strip():
+                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+                continue
+            if child.tag == 'fe-assignment':
+                fe_item = child.find("fe-assignmentitem")
+                if fe_item is not None and fe_item.text:
+                    parts.append(f"[assignment: {self._remove_newlines_and_extra_whitespaces(fe_item.text)}]")
+                if child.tail and child.tail.strip():
+                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+                continue
+            if child.tag == 'fe-selection':
+                selection_items = child.findall('fe-selectionitem')
+                items_text = [item.text.strip() for item in selection_items if item.text and item.text.strip()]
+                if items_text:
+                    parts.append(f"[selection: {', '.join(items_text)}]")
+                if child.tail and child.tail.strip():
+                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+                continue
+
+            nested_text = self._parse_element_text_content(child)
+            if nested_text:
+                parts.append(nested_text)
+
+            if child.tail and child.tail.strip():
+                parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+
+        combined = ' '.join(part for part in parts if part)
+        return self._remove_newlines_and_extra_whitespaces(combined)
+
+    def _extract_assurance_text(self, element) -> str:
+        """Collect only the primary requirement text for assurance evidence elements."""
+        parts: List[str] = []
+
+        if element.text and element.text.strip():
+            parts.append(self._remove_newlines_and_extra_whitespaces(element.text))
+
+        for child in element:
+            # Skip detailed evaluator work units such as m-workunit and similar blocks
+            if self._is_assurance_detail_element(child.tag):
+                if child.tail and child.tail.strip():
+                    parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+                continue
+
+            inline_text = self._extract_assurance_text(child)
+            if inline_text:
+                parts.append(inline_text)
+
+            if child.tail and child.tail.strip():
+                parts.append(self._remove_newlines_and_extra_whitespaces(child.tail))
+
+        if not parts:
+            return ""
+
+        combined = ' '.join(part for part in parts if part)
+        return self._remove_newlines_and_extra_whitespaces(combined)
+
+    def _parse_fe_item_text(self, fe_item) -> str:
+        """Parse the text content of a fe-item element."""
+        text = fe_item.text.strip() if fe_item.text else ''
+
+        # Process child elements within fe-item
+        for child in fe_item:
+            if child.tag == 'fe-selection':
+                text += f' [selection: {self._parse_fe_selection(child)}]'
+            elif child.tag == 'fe-assignment':
+                fe_assignment_item = child.find("fe-assignmentitem")
+                if fe_assignment_item is not None and fe_assignment_item.text:
+                    text += f' [assignment: {fe_assignment_item.text.strip()}]'
+            # Add tail text after child elements
+            if child.tail and child.tail.strip():
+                text += ' ' + self._remove_newlines_and_extra_whitespaces(child.tail.strip())
+
+        return self._remove_newlines_and_extra_whitespaces(text)
+
+    @staticmethod
+    @staticmethod
+    def _is_assurance_detail_element(tag: str) -> bool:
+        """Identify tags that contain evaluator work units or detailed guidance."""
+        if not tag:
+            return False
+
+        if tag.startswith('m-'):
+            return True
+
+        return tag == 'ae-dc-element'
+
+
+def legacy_fe_element_text(legacy: LegacyTextExtraction, element) -> str:
+    # The display tree normalized the f-element text after parsing it
+    return legacy._remove_newlines_and_extra_whitespaces(legacy._parse_fe_element_text(element))
+
+
+def collect_targets(root) -> Dict[str, List]:
+    return {
+        "element text": [el for el in root.iter() if el.tag in ELEMENT_TAGS],
+        "f-element text": [el for el in root.iter("f-element") if el.text and el.text.strip()],
+        "fe-item text": list(root.iter("fe-item")),
+    }
+
+
+def time_run(fn: Callable, elements: List) -> float:
+    started = time.perf_counter()
+    for element in elements:
+        fn(element)
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--xml", default=str(DEFAULT_XML), help="Catalog XML to extract (defaults to cc.xml)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant; the best is reported")
+    args = parser.parse_args()
+
+    root = etree.parse(args.xml).getroot()
+    legacy = LegacyTextExtraction()
+    implementations = {
+        "element text": (legacy._parse_element_text_content, element_text),
+        "f-element text": (lambda element: legacy_fe_element_text(legacy, element), FE_ELEMENT_TEXT),
+        "fe-item text": (legacy._parse_fe_item_text, FE_ITEM_TEXT),
+    }
+
+    mismatches = 0
+    print(f"{'extraction':<16} {'elements':>9} {'legacy':>10} {'assembler':>10} {'speedup':>8}")
+    for name, elements in collect_targets(root).items():
+        before, after = implementations[name]
+        for element in elements:
+            if before(element) != after(element):
+                mismatches += 1
+                print(f"mismatch in {name}: {element.get('id') or element.tag}", file=sys.stderr)
+
+        # Interleave the timed runs so machine noise affects both variants alike
+        legacy_seconds = assembler_seconds = float("inf")
+        for _ in range(args.repeat):
+            legacy_seconds = min(legacy_seconds, time_run(before, elements))
+            assembler_seconds = min(assembler_seconds, time_run(after, elements))
+        print(
+            f"{name:<16} {len(elements):>9} {legacy_seconds * 1000:>8.1f}ms {assembler_seconds * 1000:>8.1f}ms "
+            f"{legacy_seconds / assembler_seconds:>7.2f}x"
+        )
+
+    print("\noutput identical" if not mismatches else f"\n{mismatches} mismatching elements")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
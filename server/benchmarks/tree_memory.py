@@ -0,0 +1,124 @@
+"""
+Memory and time of building the display tree and component records.
+
+Compares the slotted XmlNode/ComponentRecord used by the parser with plain
+``__dict__`` objects and dict records, on the repository catalog by default:
+
+    python -m benchmarks.tree_memory [--xml PATH] [--repeat N]
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app import xml_parser_service
+from app.xml_parser_service import XmlNode, XmlParserService
+
+
+DEFAULT_XML = Path(__file__).resolve().parents[2] / "oldparser" / "cc.xml"
+
+
+class DictXmlNode:
+    """The XmlNode layout before slots: a per-instance __dict__ and attribute dict."""
+
+    def __init__(self, label: str, data: Optional[str] = None):
+        self.label = label
+        self.data = data
+        self.children: List["DictXmlNode"] = []
+        self.attributes: Dict[str, str] = {}
+
+    def add_child(self, child: "DictXmlNode") -> None:
+        self.children.append(child)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'label': self.label,
+            'data': self.data,
+            'attributes': self.attributes,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+def count_nodes(node) -> int:
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def build(xml_content: str, node_class, record_factory):
+    """Build the display tree and component records with the given node class."""
+    original_node = xml_parser_service.XmlNode
+    xml_parser_service.XmlNode = node_class
+    try:
+        parser = XmlParserService()
+        document = parser._parse_document(xml_content)
+        records = [record_factory(record) for batch, _ in parser.walk_catalog(document, build_tree=True)
+                   for record in batch]
+        return parser.root_node, records
+    finally:
+        xml_parser_service.XmlNode = original_node
+
+
+def measure_memory(xml_content: str, node_class, record_factory) -> Dict[str, float]:
+    """Memory allocated by the tree and records, excluding the lxml document."""
+    original_node = xml_parser_service.XmlNode
+    xml_parser_service.XmlNode = node_class
+    try:
+        parser = XmlParserService()
+        document = parser._parse_document(xml_content)
+        gc.collect()
+        tracemalloc.start()
+        records = [record_factory(record) for batch, _ in parser.walk_catalog(document, build_tree=True)
+                   for record in batch]
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "retained_bytes": retained,
+            "peak_bytes": peak,
+            "nodes": count_nodes(parser.root_node),
+            "records": len(records),
+        }
+    finally:
+        xml_parser_service.XmlNode = original_node
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--xml", default=str(DEFAULT_XML), help="Catalog XML to build (defaults to cc.xml)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant; the best is reported")
+    args = parser.parse_args()
+
+    xml_content = Path(args.xml).read_text(encoding="utf-8")
+    configurations = {
+        "dict nodes + dict records": (DictXmlNode, lambda record: record._asdict()),
+        "slotted nodes + tuple records": (XmlNode, lambda record: record),
+    }
+    variants = {name: measure_memory(xml_content, *config) for name, config in configurations.items()}
+
+    # Interleave the timed runs so machine noise affects both variants alike
+    for name in variants:
+        variants[name]["seconds"] = float("inf")
+    for _ in range(args.repeat):
+        for name, config in configurations.items():
+            gc.collect()
+            started = time.perf_counter()
+            build(xml_content, *config)
+            variants[name]["seconds"] = min(variants[name]["seconds"], time.perf_counter() - started)
+
+    print(f"{'variant':<32} {'nodes':>7} {'records':>8} {'retained':>11} {'peak':>11} {'best time':>10}")
+    for name, result in variants.items():
+        print(
+            f"{name:<32} {result['nodes']:>7} {result['records']:>8} "
+            f"{result['retained_bytes'] / 1024 / 1024:>9.2f}MB {result['peak_bytes'] / 1024 / 1024:>9.2f}MB "
+            f"{result['seconds'] * 1000:>8.1f}ms"
+        )
+
+    before, after = variants.values()
+    saved = 1 - after["retained_bytes"] / before["retained_bytes"]
+    speedup = before["seconds"] / after["seconds"]
+    print(f"\nretained memory saved: {saved:.0%}, build time ratio: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
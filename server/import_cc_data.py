@@ -3,86 +3,58 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import Sequence, Tuple, Type
-
-from sqlalchemy import delete
-
-from app.database import Base, SessionLocal, engine
-from app.models import (
-    ComponentFamilyBase,
-    ElementListDb,
-    FauDb,
-    FcoDb,
-    FcsDb,
-    FdpDb,
-    FiaDb,
-    FmtDb,
-    FprDb,
-    FptDb,
-    FruDb,
-    FtaDb,
-    FtpDb,
-    AcoDb,
-    AdvDb,
-    AgdDb,
-    AlcDb,
-    ApeDb,
-    AseDb,
-    AteDb,
-    AvaDb,
-)
-from app.xml_parser_service import XmlParserService
-
-
-FUNCTIONAL_MODELS: Tuple[Type[ComponentFamilyBase], ...] = (
-    FauDb,
-    FcoDb,
-    FcsDb,
-    FdpDb,
-    FiaDb,
-    FmtDb,
-    FprDb,
-    FptDb,
-    FruDb,
-    FtaDb,
-    FtpDb,
-)
-
-ASSURANCE_MODELS: Tuple[Type[ComponentFamilyBase], ...] = (
-    AcoDb,
-    AdvDb,
-    AgdDb,
-    AlcDb,
-    ApeDb,
-    AseDb,
-    AteDb,
-    AvaDb,
-)
-
-SPECIAL_MODELS: Tuple[Type[ElementListDb], ...] = (
-    ElementListDb,
-)
-
-
-def clear_tables(models: Sequence[Type], *, session) -> None:
-    """Delete all rows from the provided ORM models."""
-    for model in models:
-        session.execute(delete(model))
-
-
-def import_xml(xml_path: Path, *, reset: bool = True) -> None:
-    """Import the provided XML file into the configured database."""
+from typing import List, Optional, Sequence
+
+from app.catalog_snapshot import SNAPSHOT_PATH, export_snapshot, read_snapshot_header, source_digest
+from app.database import Base, SessionLocal, add_missing_columns, engine
+from app.full_text import ensure_search_indexes
+from app.xml_sources import CATALOG_SUFFIX_HINT, catalog_format, expand_catalog_paths, import_catalog_files
+
+
+# Keys of the import "timings" block, in pipeline order
+PHASE_LABELS = {
+    "parse": "XML parsing",
+    "extract": "Text extraction",
+    "build_rows": "Row construction",
+    "write_components": "Component writes",
+    "write_element_lists": "Element list upserts",
+    "commit": "Commit",
+    "swap": "Table swap",
+    "total": "Total",
+}
+# Conflicts listed individually before the rest are summarised
+MAX_CONFLICTS_SHOWN = 20
+
+
+def import_xml(
+    xml_paths: Sequence[Path],
+    *,
+    reset: bool = True,
+    stream: bool = False,
+    batch_size: Optional[int] = None,
+    incremental: bool = False,
+    parallel: bool = False,
+    snapshot: Optional[Path] = None,
+) -> None:
+    """Import the provided XML files, .xml.gz files and .zip bundles into the configured database.
+
+    Several files are imported together; an element id defined by more than one of
+    them keeps the definition of the first. When ``snapshot`` is given the imported
+    catalog is exported there afterwards.
+    """
     Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    ensure_search_indexes(engine)
 
     session = SessionLocal()
     try:
-        if reset:
-            clear_tables(FUNCTIONAL_MODELS + ASSURANCE_MODELS + SPECIAL_MODELS, session=session)
-            session.commit()
-
-        xml_content = xml_path.read_text(encoding="utf-8")
-        parser = XmlParserService()
-        result = parser.import_to_database(xml_content, session)
+        # A reset loads the catalog into staging tables and swaps them in once it
+        # succeeded, so readers never see empty or half-filled tables.
+        options = dict(batch_size=batch_size, incremental=incremental, staged=reset and not incremental)
+        # lxml reads the file (or the decompressed archive members) itself, so the
+        # catalog is never loaded into a Python buffer here. Several files are each
+        # parsed in a worker process with --parallel.
+        result = import_catalog_files(xml_paths, session, parallel=parallel, stream=stream, **options)
 
         # XmlParserService commits internally, so just print the summary here.
         print("Import complete:")
@@ -90,13 +62,55 @@ def import_xml(xml_path: Path, *, reset: bool = True) -> None:
         print(f"  Components imported: {result.get('components_imported', 0)}")
         print(f"  Components failed: {result.get('components_failed', 0)}")
         print(f"  Element lists imported: {result.get('element_lists_imported', 0)}")
+        if result.get('sync_stats') is not None:
+            print(f"  {result.get('message')}")
         tables_used = result.get('tables_used') or []
         if tables_used:
             print(f"  Tables populated: {', '.join(sorted(tables_used))}")
+        table_stats = result.get('table_stats') or {}
+        if table_stats:
+            print("  Write throughput:")
+            for table_name in sorted(table_stats):
+                stats = table_stats[table_name]
+                rate = stats.get('rows_per_second')
+                rate_text = f"{rate:,.0f} rows/s" if rate else "n/a"
+                print(f"    {table_name:<16} {stats['rows']:>6} rows  {rate_text}")
+        timings = result.get('timings') or {}
+        if timings:
+            print("  Phase timings:")
+            for phase in PHASE_LABELS:
+                print(f"    {PHASE_LABELS[phase]:<22} {timings.get(phase, 0.0):>8.3f}s")
+        conflicts = result.get('conflicts') or []
+        if conflicts:
+            differing = sum(1 for conflict in conflicts if not conflict['identical'])
+            print(f"  Element ids defined in several files ({differing} differ, "
+                  f"{len(conflicts) - differing} identical; first definition kept):")
+            # Differing definitions are the ones worth reviewing, so they come first
+            for conflict in sorted(conflicts, key=lambda conflict: conflict['identical'])[:MAX_CONFLICTS_SHOWN]:
+                kind = "identical" if conflict['identical'] else "differs"
+                print(f"    - {conflict['element']} ({conflict['table']}): kept {conflict['kept']}, "
+                      f"skipped {conflict['skipped']} [{kind}]")
+            if len(conflicts) > MAX_CONFLICTS_SHOWN:
+                print(f"    ... and {len(conflicts) - MAX_CONFLICTS_SHOWN} more")
         if result.get('errors'):
             print("  Errors:")
             for err in result['errors']:
                 print(f"    - {err}")
+
+        # Staleness is only tracked for snapshots built from a single catalog file
+        digest = source_digest(xml_paths[0]) if len(xml_paths) == 1 else None
+        if snapshot is not None and result.get('success'):
+            header = export_snapshot(
+                session, snapshot, source_digest=digest, source=', '.join(path.name for path in xml_paths)
+            )
+            print(f"Snapshot written to {snapshot} ({sum(header['tables'].values())} rows)")
+        elif digest is not None and SNAPSHOT_PATH.is_file():
+            try:
+                stale = read_snapshot_header(SNAPSHOT_PATH).get('source_digest') != digest
+            except ValueError:
+                stale = True
+            if stale:
+                print(f"Note: {SNAPSHOT_PATH} was built from another catalog; refresh it with --export-snapshot")
     finally:
         session.close()
 
@@ -111,29 +125,87 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--xml",
         dest="xml",
-        default=str(default_xml_path()),
-        help="Path to the Common Criteria XML file (defaults to repository cc.xml)",
+        nargs="+",
+        default=[str(default_xml_path())],
+        help=(
+            "Common Criteria XML files, .xml.gz files, .zip bundles or directories of them "
+            "(defaults to repository cc.xml). With several files the first definition of an element id wins"
+        ),
     )
     parser.add_argument(
         "--skip-reset",
         dest="skip_reset",
         action="store_true",
-        help="Do not clear existing requirement tables before importing",
+        help="Append to the existing requirement tables instead of replacing them",
+    )
+    parser.add_argument(
+        "--stream",
+        dest="stream",
+        action="store_true",
+        help="Stream the XML with iterparse to keep memory flat for very large catalogs",
+    )
+    parser.add_argument(
+        "--batch-size",
+        dest="batch_size",
+        type=int,
+        default=None,
+        help="Rows per bulk insert batch (defaults to XML_IMPORT_BATCH_SIZE or 1000)",
+    )
+    parser.add_argument(
+        "--incremental",
+        dest="incremental",
+        action="store_true",
+        help="Keep existing rows and only apply changes detected by content hash",
+    )
+    parser.add_argument(
+        "--parallel",
+        dest="parallel",
+        action="store_true",
+        help="Parse each file (or, for a single file, each f-class/a-class) in a worker process",
+    )
+    parser.add_argument(
+        "--export-snapshot",
+        dest="snapshot",
+        nargs="?",
+        const=str(SNAPSHOT_PATH),
+        default=None,
+        help=f"After importing, write the catalog snapshot loaded by an empty database at startup (defaults to {SNAPSHOT_PATH})",
     )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    xml_path = Path(args.xml)
-
-    if not xml_path.exists():
-        raise SystemExit(f"XML file not found: {xml_path}")
+    for path in map(Path, args.xml):
+        if not path.exists():
+            raise SystemExit(f"XML file not found: {path}")
+    xml_paths: List[Path] = expand_catalog_paths(args.xml)
+    if not xml_paths:
+        raise SystemExit(f"No catalog files ({CATALOG_SUFFIX_HINT}) found in {', '.join(args.xml)}")
+    for path in xml_paths:
+        if catalog_format(path.name) is None:
+            raise SystemExit(f"Unsupported catalog file: {path} (expected {CATALOG_SUFFIX_HINT})")
 
     reset = not args.skip_reset
-    action = "Importing" if not reset else "Resetting tables and importing"
-    print(f"{action} data from {xml_path}")
-    import_xml(xml_path, reset=reset)
+    if args.incremental:
+        action = "Incrementally importing"
+    else:
+        action = "Importing" if not reset else "Replacing the catalog with"
+    if len(xml_paths) == 1:
+        print(f"{action} data from {xml_paths[0]}")
+    else:
+        print(f"{action} data from {len(xml_paths)} files:")
+        for path in xml_paths:
+            print(f"  {path}")
+    import_xml(
+        xml_paths,
+        reset=reset,
+        stream=args.stream,
+        batch_size=args.batch_size,
+        incremental=args.incremental,
+        parallel=args.parallel,
+        snapshot=Path(args.snapshot) if args.snapshot else None,
+    )
 
 
 if __name__ == "__main__":
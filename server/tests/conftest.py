@@ -0,0 +1,6 @@
+import os
+import tempfile
+
+# The app binds its engine when app.database is first imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="ccgentool2-tests-"), "test.db"))
+os.environ.setdefault("CATALOG_SNAPSHOT_BOOTSTRAP", "0")
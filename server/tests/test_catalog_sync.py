@@ -0,0 +1,111 @@
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.catalog_sync import IncrementalCatalogSync, compute_content_hash
+from app.database import Base
+from app.models import ElementListDb, FauDb
+
+
+TABLE = FauDb.__table__
+
+
+def catalog_row(element, text):
+    row = {
+        "class": "fau", "family": "fau_gen", "component": element.rsplit(".", 1)[0],
+        "component_name": "Audit data generation", "element": element, "element_item": text,
+        "source_file": "cc.xml",
+    }
+    return {**row, "content_hash": compute_content_hash(row)}
+
+
+def hand_made_row(element, text):
+    # Created through the API: no content hash or source file
+    return {**{column: None for column in catalog_row("x.1", "")}, "class": "fau", "element": element, "element_item": text}
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[TABLE, ElementListDb.__table__])
+    return Session(engine)
+
+
+def test_incremental_sync_keeps_hand_made_duplicate_and_null_key_rows():
+    db = make_session()
+    imported = catalog_row("fau_gen.1.1", "old text")
+    db.execute(insert(TABLE), [
+        imported,
+        # Duplicate left by an earlier append-only import
+        imported,
+        # Hand-made rows: a copy of an imported id and several without an element id
+        hand_made_row("fau_gen.1.1", "my note"),
+        *(hand_made_row(None, f"draft {index}") for index in range(6)),
+    ])
+    db.commit()
+
+    sync = IncrementalCatalogSync(db, {TABLE: "element"})
+    sync.add(TABLE, catalog_row("fau_gen.1.1", "new text"))
+    sync.flush()
+    db.commit()
+
+    rows = db.execute(select(TABLE.c.element, TABLE.c.element_item, TABLE.c.content_hash).order_by(TABLE.c.id)).all()
+    assert [(element, text) for element, text, _ in rows] == [
+        ("fau_gen.1.1", "new text"),
+        ("fau_gen.1.1", "my note"),
+        *((None, f"draft {index}") for index in range(6)),
+    ]
+    assert sync.sync_stats["fau_db"] == {"inserted": 0, "updated": 1, "deleted": 1, "unchanged": 0, "skipped": 0}
+
+
+def test_incremental_sync_leaves_hand_made_row_created_before_the_import():
+    db = make_session()
+    db.execute(insert(TABLE), [hand_made_row("fau_gen.1.1", "my note"), catalog_row("fau_gen.1.1", "old text")])
+    db.commit()
+
+    sync = IncrementalCatalogSync(db, {TABLE: "element"})
+    sync.add(TABLE, catalog_row("fau_gen.1.1", "new text"))
+    sync.flush()
+    db.commit()
+
+    rows = db.execute(select(TABLE.c.element_item, TABLE.c.content_hash).order_by(TABLE.c.id)).all()
+    assert [text for text, _ in rows] == ["my note", "new text"]
+    assert rows[0].content_hash is None
+    assert sync.sync_stats["fau_db"] == {"inserted": 0, "updated": 1, "deleted": 0, "unchanged": 0, "skipped": 0}
+
+
+def test_incremental_sync_keeps_hand_made_row_holding_a_unique_key():
+    db = make_session()
+    element_lists = ElementListDb.__table__
+    db.execute(insert(element_lists), [{"element": "fau_gen.1.1", "element_index": "fau_gen.1.1_1", "item_list": "my list"}])
+    db.commit()
+
+    row = {"element": "fau_gen.1.1", "element_index": "fau_gen.1.1_1", "item_list": "catalog list", "source_file": "cc.xml"}
+    sync = IncrementalCatalogSync(db, {element_lists: "element_index"})
+    sync.add(element_lists, {**row, "content_hash": compute_content_hash(row)})
+    sync.flush()
+    db.commit()
+
+    assert db.execute(select(element_lists.c.item_list, element_lists.c.content_hash)).all() == [("my list", None)]
+    assert sync.sync_stats["element_list_db"] == {
+        "inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0, "skipped": 1,
+    }
+
+
+def test_incremental_sync_removes_imported_rows_that_left_the_catalog():
+    db = make_session()
+    db.execute(insert(TABLE), [catalog_row("fau_gen.1.1", "kept"), catalog_row("fau_gen.1.2", "gone")])
+    db.commit()
+
+    sync = IncrementalCatalogSync(db, {TABLE: "element"})
+    sync.add(TABLE, catalog_row("fau_gen.1.1", "kept"))
+    sync.flush()
+    db.commit()
+
+    assert db.execute(select(TABLE.c.element)).scalars().all() == ["fau_gen.1.1"]
+    assert sync.sync_stats["fau_db"] == {"inserted": 0, "updated": 0, "deleted": 1, "unchanged": 1, "skipped": 0}
+
+
+def test_content_hash_ignores_the_source_file():
+    row = catalog_row("fau_gen.1.1", "text")
+    renamed = {**row, "source_file": "bundle.zip:cc.xml"}
+    assert compute_content_hash(renamed) == row["content_hash"]
+    assert compute_content_hash({**row, "element_item": "other"}) != row["content_hash"]
@@ -0,0 +1,60 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import FauDb
+from app.pagination import decode_cursor, encode_cursor, keyset_filter, sort_keys
+
+
+TABLE = FauDb.__table__
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        for index in range(3):
+            client.post("/families/fau_db", json={"class": "fau", "element": f"fau_gen.1.{index}"})
+        yield client
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("component", ["fau_gen.1", None, 7])
+    assert decode_cursor(cursor) == ("component", ["fau_gen.1", None, 7])
+
+
+@pytest.mark.parametrize("after", [[[]], [{}], [True], ["x", [1]]])
+def test_decode_cursor_rejects_non_scalar_values(after):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("id", after))
+
+
+@pytest.mark.parametrize("sort, after", [("id", []), ("id", [1, 2]), ("id", ["1"]), ("id", [None]), ("element", [3, 1])])
+def test_keyset_filter_rejects_values_that_do_not_fit_the_keys(sort, after):
+    with pytest.raises(ValueError):
+        keyset_filter(sort_keys(TABLE, sort), after, "sqlite")
+
+
+@pytest.mark.parametrize("cursor", [
+    # A cursor whose value is a list: after=[[]]
+    "eyJzb3J0IjoiaWQiLCJhZnRlciI6W1tdXX0",
+    encode_cursor("id", [1, 2]),
+    encode_cursor("id", ["not an id"]),
+    "not-base64!",
+])
+def test_malformed_cursor_is_a_bad_request(client, cursor):
+    response = client.get("/families/fau_db", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_cursor_pages_through_every_row(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, "sort": "element", **({"cursor": cursor} if cursor else {})}
+        response = client.get("/families/fau_db", params=params)
+        assert response.status_code == 200
+        seen += [row["element"] for row in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+    assert seen == ["fau_gen.1.0", "fau_gen.1.1", "fau_gen.1.2"]